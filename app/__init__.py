@@ -1,25 +1,50 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from .commands import register_commands
+from .middleware.admission import register_admission_control
+from .middleware.compression import register_compression
+from .middleware.metrics import register_metrics
+from .middleware.query_stats import register_query_stats
+from .middleware.replica_routing import register_replica_routing
+from .utils.db_pool import pool_engine_options
+from .utils.db_routing import RoutingSession, replica_binds
 from .utils.errors import register_error_handlers
+from .utils.json_provider import FastJSONProvider
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 
 def create_app():
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     from .config import Config
     app.config.from_object(Config)
+    if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', pool_engine_options(app.config))
+    if app.config['READ_REPLICA_URIS']:
+        app.config['SQLALCHEMY_BINDS'] = {**(app.config.get('SQLALCHEMY_BINDS') or {}),
+                                          **replica_binds(app.config['READ_REPLICA_URIS'])}
     
     db.init_app(app)
     migrate.init_app(app, db)
     
     from .routes.pins import pins_bp
     from .routes.users import users_bp
+    from .routes.internal import internal_bp
+    from .routes.authors import authors_bp
     app.register_blueprint(users_bp, url_prefix='/api/v1')
     app.register_blueprint(pins_bp, url_prefix='/api/v1')
+    app.register_blueprint(authors_bp, url_prefix='/api/v1')
+    app.register_blueprint(internal_bp, url_prefix='/internal')
     
     register_error_handlers(app)
+    register_metrics(app)
+    register_query_stats(app)
+    register_admission_control(app)
+    register_replica_routing(app)
+    register_compression(app)
+    register_commands(app)
     
     return app
\ No newline at end of file
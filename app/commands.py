@@ -0,0 +1,114 @@
+import asyncio
+import os
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from .utils.pin_io import FORMATS, PinWriter, RecordError, detect_format, read_pins
+
+authors_cli = AppGroup('authors', help="Maintain the per-author pin summary.")
+pins_cli = AppGroup('pins', help="Bulk import and export pins.")
+
+
+@authors_cli.command('rebuild')
+def rebuild_authors():
+    """Recompute the author summary from the pins table."""
+    from .models.author_stats import AuthorStats
+    count = AuthorStats.rebuild()
+    click.echo(f"Rebuilt author summary: {count} authors")
+
+
+def rate(rows, started):
+    elapsed = time.perf_counter() - started
+    return rows / elapsed if elapsed > 0 else 0.0
+
+
+@pins_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), help="Default: from the file extension.")
+@click.option('--chunk-size', default=1000, show_default=True, help="Rows per insert and commit.")
+@click.option('--resume/--restart', default=True, show_default=True,
+              help="Continue after the last committed chunk of an earlier run on the same file.")
+def import_pins(path, fmt, chunk_size, resume):
+    """Stream pins from a CSV or NDJSON file into the database in chunks.
+
+    Each chunk is inserted with Pin.bulk_create and committed on its own,
+    together with the byte offset after it in the pin_imports table, so an
+    interrupted import picks up exactly where the last commit left off when
+    run again. The progress row is removed once the whole file is in.
+    """
+    from .models.pin import Pin
+    from .models.pin_import import PinImport
+    try:
+        fmt = detect_format(path, fmt)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    source = os.path.abspath(path)
+    progress = PinImport.get(source) if resume else None
+    if not resume:
+        PinImport.clear(source)
+    start_offset, resumed = (progress.byte_offset, progress.row_count) if progress else (0, 0)
+    if resumed:
+        click.echo(f"Resuming after {resumed} rows", err=True)
+
+    imported, chunk, offset, started = resumed, [], start_offset, time.perf_counter()
+
+    def flush():
+        nonlocal imported, chunk
+        total = imported + len(chunk)
+        asyncio.run(Pin.bulk_create(chunk, chunk_size=chunk_size,
+                                    before_commit=lambda: PinImport.record(source, offset, total)))
+        imported, chunk = total, []
+        click.echo(f"{imported} rows imported ({rate(imported - resumed, started):.0f} rows/sec)", err=True)
+
+    with open(path, 'rb') as f:
+        try:
+            for pin_data, offset in read_pins(f, fmt, start_offset):
+                chunk.append(pin_data)
+                if len(chunk) >= chunk_size:
+                    flush()
+        except RecordError as e:
+            raise click.ClickException(f"{e} (after {imported} committed rows; fix it and run again to resume)")
+        if chunk:
+            flush()
+
+    PinImport.clear(source)
+    new_rows = imported - resumed
+    click.echo(f"Imported {new_rows} rows in {time.perf_counter() - started:.2f}s "
+               f"({rate(new_rows, started):.0f} rows/sec)", err=True)
+
+
+@pins_cli.command('export')
+@click.argument('path', type=click.Path(dir_okay=False, allow_dash=True))
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), help="Default: from the file extension, ndjson for -.")
+@click.option('--author', help="Only export this author's pins.")
+@click.option('--batch-size', default=1000, show_default=True, help="Rows fetched per round trip.")
+def export_pins(path, fmt, author, batch_size):
+    """Stream pins to a CSV or NDJSON file ("-" for stdout) in date_created order.
+
+    Rows are read through a server-side cursor in batches of --batch-size,
+    so memory use does not grow with the table.
+    """
+    from .models.pin import Pin
+    try:
+        fmt = detect_format(path, fmt or ('ndjson' if path == '-' else None))
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    exported, started = 0, time.perf_counter()
+    with click.open_file(path, 'w', encoding='utf-8') as f:
+        writer = PinWriter(f, fmt, Pin.FIELDS, current_app.json.dumps)
+        for pin in Pin.iter_all(author_filter=author, order_dir='asc', batch_size=batch_size):
+            writer.write(pin)
+            exported += 1
+            if exported % (batch_size * 100) == 0:
+                click.echo(f"{exported} rows exported ({rate(exported, started):.0f} rows/sec)", err=True)
+
+    click.echo(f"Exported {exported} rows in {time.perf_counter() - started:.2f}s "
+               f"({rate(exported, started):.0f} rows/sec)", err=True)
+
+
+def register_commands(app):
+    app.cli.add_command(authors_cli)
+    app.cli.add_command(pins_cli)
@@ -0,0 +1,86 @@
+import time
+from flask import current_app, g, jsonify, request
+from ..utils.admission import ConcurrencyLimiter
+
+# Blueprints whose every route counts as authentication work
+AUTH_BLUEPRINTS = {'users'}
+# Blueprints that are never limited, so operators can still look inside an overloaded app
+EXEMPT_BLUEPRINTS = {'internal'}
+READ_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+def route_group(blueprint, method):
+    """Classify a request as 'auth', 'reads' or 'writes', or None when it is not limited."""
+    if blueprint in EXEMPT_BLUEPRINTS:
+        return None
+    if blueprint in AUTH_BLUEPRINTS:
+        return 'auth'
+    return 'reads' if method in READ_METHODS else 'writes'
+
+
+def register_admission_control(app):
+    """Limit concurrent requests per route group and shed the excess with 503 + Retry-After.
+
+    Configured with ADMISSION_ENABLED, ADMISSION_READ_LIMIT, ADMISSION_WRITE_LIMIT,
+    ADMISSION_AUTH_LIMIT, ADMISSION_QUEUE_SIZE and ADMISSION_QUEUE_TIMEOUT_MS;
+    ADMISSION_ADAPTIVE lets each limit shrink while mean latency stays above
+    ADMISSION_TARGET_LATENCY_MS. Routes of the internal blueprint are exempt.
+    A streamed response keeps its slot until the body is fully sent and the
+    response is closed, so long NDJSON streams count against the limit.
+    """
+    if not app.config.get('ADMISSION_ENABLED', True):
+        return
+    config = app.config
+    limiters = {
+        group: ConcurrencyLimiter(
+            limit=config.get(key, default),
+            max_queue=config.get('ADMISSION_QUEUE_SIZE', 32),
+            queue_timeout=config.get('ADMISSION_QUEUE_TIMEOUT_MS', 100) / 1000,
+            adaptive=config.get('ADMISSION_ADAPTIVE', False),
+            target_latency=config.get('ADMISSION_TARGET_LATENCY_MS', 250) / 1000,
+            min_limit=config.get('ADMISSION_MIN_LIMIT', 2),
+            window=config.get('ADMISSION_ADAPTIVE_WINDOW', 50)
+        )
+        for group, key, default in (('reads', 'ADMISSION_READ_LIMIT', 64),
+                                    ('writes', 'ADMISSION_WRITE_LIMIT', 16),
+                                    ('auth', 'ADMISSION_AUTH_LIMIT', 8))
+    }
+    app.extensions['admission'] = limiters
+    retry_after = str(config.get('ADMISSION_RETRY_AFTER', 1))
+
+    @app.before_request
+    def admit_request():
+        group = route_group(request.blueprint, request.method)
+        if group is None:
+            return None
+        if not limiters[group].acquire():
+            return jsonify({"error": "Service Unavailable",
+                            "message": "Server is overloaded, retry shortly"}), 503, {"Retry-After": retry_after}
+        g.admission = (group, time.perf_counter())
+        return None
+
+    def release(admission):
+        group, started = admission
+        limiters[group].release(time.perf_counter() - started)
+
+    @app.after_request
+    def hold_slot_while_streaming(response):
+        # The body of a streamed response is produced after teardown
+        if response.is_streamed and 'admission' in g:
+            admission = g.pop('admission')
+            response.call_on_close(lambda: release(admission))
+        return response
+
+    @app.teardown_request
+    def release_request(exc):
+        admission = g.pop('admission', None)
+        if admission is not None:
+            release(admission)
+
+
+def admission_status():
+    """Return the limiter state of each route group, or None when admission control is off."""
+    limiters = current_app.extensions.get('admission')
+    if limiters is None:
+        return None
+    return {group: limiter.stats() for group, limiter in limiters.items()}
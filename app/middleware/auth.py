@@ -1,7 +1,8 @@
+import hmac
 import os
 from functools import wraps
-from flask import request, jsonify
-from ..utils.jwt_utils import create_jwt_token, verify_jwt_token
+from flask import current_app, request, jsonify
+from ..utils.jwt_utils import create_jwt_token, verify_jwt_token_cached
 
 def authenticate(f):
     """Decorator to authenticate a user using JWT."""
@@ -11,9 +12,21 @@ def authenticate(f):
         if not token:
             return jsonify({"message": "Missing token"}), 401
         token = token.split(" ")[1] 
-        payload = verify_jwt_token(token, token_type='access')
+        payload = verify_jwt_token_cached(token, token_type='access')
         if not payload:
             return jsonify({"message": "Invalid token"}), 401
         return await f(*args, **kwargs)
 
-    return decorated_function
\ No newline at end of file
+    return decorated_function
+
+
+def require_api_key(f):
+    """Decorator restricting internal endpoints to callers sending X-API-Key: API_TOKEN."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        expected = current_app.config.get('API_TOKEN')
+        if not expected or not hmac.compare_digest(request.headers.get('X-API-Key', ''), expected):
+            return jsonify({"message": "Invalid API key"}), 401
+        return f(*args, **kwargs)
+
+    return decorated_function
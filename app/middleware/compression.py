@@ -0,0 +1,67 @@
+import zlib
+from flask import request
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/html', 'text/plain', 'text/csv'}
+
+# zlib wbits selecting the container for each content coding
+WBITS = {'gzip': 31, 'deflate': 15}
+
+
+def register_compression(app):
+    """Compress responses with gzip or deflate when the client accepts it.
+
+    Configured with COMPRESSION_ENABLED, COMPRESSION_LEVEL (1-9) and
+    COMPRESSION_MIN_SIZE (bytes; smaller buffered bodies are sent as-is).
+    Streamed responses are compressed chunk by chunk with a sync flush, so
+    each chunk still reaches the client as soon as it is produced.
+    """
+    if not app.config.get('COMPRESSION_ENABLED', True):
+        return
+    level = app.config.get('COMPRESSION_LEVEL', 6)
+    min_size = app.config.get('COMPRESSION_MIN_SIZE', 500)
+
+    @app.after_request
+    def compress_response(response):
+        if (response.mimetype not in COMPRESSIBLE_MIMETYPES or response.status_code < 200
+                or response.status_code in (204, 304) or response.direct_passthrough
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(list(WBITS))
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[encoding])
+            response.set_data(compressor.compress(data) + compressor.flush())
+
+        response.headers['Content-Encoding'] = encoding
+        # The compressed bytes differ from the identity representation
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def compress_stream(chunks, encoding, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[encoding])
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        # Let the wrapped generator release what it holds (e.g. a DB session)
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
@@ -0,0 +1,44 @@
+import time
+from flask import current_app, g, request
+from ..utils.metrics import RequestMetrics
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def register_metrics(app):
+    """Record latency, body sizes and in-flight requests for every request.
+
+    Enabled with METRICS_ENABLED. Endpoints are labelled by URL rule rather
+    than path, so /pins/1 and /pins/2 share one series. Register this before
+    other after_request hooks (such as compression) so the response size is
+    what actually goes on the wire.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    metrics = app.extensions['metrics'] = RequestMetrics()
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+        metrics.request_started()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.get('metrics_started')
+        if started is not None:
+            endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+            response_bytes = None if response.is_streamed else response.content_length
+            metrics.observe(request.method, endpoint, response.status_code, time.perf_counter() - started,
+                            request.content_length or 0, response_bytes)
+        return response
+
+    @app.teardown_request
+    def finish_request(exc):
+        # Teardown runs even when after_request does not, so the gauge cannot leak
+        if g.pop('metrics_started', None) is not None:
+            metrics.request_finished()
+
+
+def get_metrics():
+    """Return the app's RequestMetrics, or None when metrics are disabled."""
+    return current_app.extensions.get('metrics')
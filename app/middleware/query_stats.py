@@ -0,0 +1,94 @@
+import logging
+import time
+from collections import Counter
+from flask import g, has_app_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Longest rendering of a parameter set written to the slow-query log
+MAX_LOGGED_PARAMS = 500
+
+
+class QueryStats:
+    """SQL statements issued while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold):
+        """Statements issued at least `threshold` times, most frequent first."""
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= threshold]
+
+
+def format_params(parameters):
+    text = repr(parameters)
+    return text if len(text) <= MAX_LOGGED_PARAMS else text[:MAX_LOGGED_PARAMS] + '...'
+
+
+def register_query_stats(app):
+    """Count SQL statements and database time per request, log slow statements and flag N+1 patterns.
+
+    Listens to cursor events on every engine of the app. Statements slower
+    than SLOW_QUERY_MS are logged with their parameters, inside or outside a
+    request. Within a request, a statement text seen N_PLUS_ONE_THRESHOLD
+    times or more is logged as a likely N+1; bound parameters are not part of
+    the text, so the same query for different ids counts as one shape. In
+    debug mode the totals are returned as X-SQL-Count, X-SQL-Time-Ms and
+    X-SQL-N-Plus-One response headers. Call after db.init_app(app).
+    """
+    if not app.config.get('QUERY_STATS_ENABLED', True):
+        return
+    slow_seconds = app.config.get('SLOW_QUERY_MS', 200) / 1000
+    n_plus_one_threshold = app.config.get('N_PLUS_ONE_THRESHOLD', 5)
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info['query_started'].pop()
+        if seconds >= slow_seconds:
+            logger.warning("Slow query (%.1f ms): %s | parameters: %s", seconds * 1000, statement,
+                           format_params(parameters))
+        stats = g.get('query_stats') if has_app_context() else None
+        if stats is not None:
+            stats.record(statement, seconds)
+
+    def handle_error(context):
+        started = context.connection.info.get('query_started') if context.connection is not None else None
+        if started:
+            started.pop()
+
+    with app.app_context():
+        engines = list(app.extensions['sqlalchemy'].engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+        event.listen(engine, 'handle_error', handle_error)
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = QueryStats()
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.get('query_stats')
+        if stats is None:
+            return response
+        repeated = stats.repeated(n_plus_one_threshold)
+        for statement, count in repeated:
+            logger.warning("Possible N+1 in %s %s: statement ran %d times: %s", request.method,
+                           request.path, count, statement)
+        if app.debug:
+            response.headers['X-SQL-Count'] = str(stats.count)
+            response.headers['X-SQL-Time-Ms'] = f"{stats.seconds * 1000:.2f}"
+            if repeated:
+                response.headers['X-SQL-N-Plus-One'] = str(len(repeated))
+        return response
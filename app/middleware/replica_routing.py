@@ -0,0 +1,44 @@
+import itertools
+import time
+from flask import g, request
+from ..utils.db_routing import REPLICA_BIND_PREFIX
+
+# Cookie holding the Unix time of the client's last write
+LAST_WRITE_COOKIE = 'last_write'
+# Requests with any other method may read-modify-write, so they read from the primary
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+def register_replica_routing(app):
+    """Route reads to the replica binds and give each client read-your-writes.
+
+    Needs db = SQLAlchemy(session_options={"class_": RoutingSession}) and
+    replica binds in SQLALCHEMY_BINDS (see replica_binds); does nothing when
+    there are none. A request that writes sets the last_write cookie, and for
+    READ_YOUR_WRITES_SECONDS after that the same client's reads go to the
+    primary, whichever worker serves them, so it never sees a replica that
+    has not caught up with its own write yet. Requests with a non-safe
+    method (POST, PUT, PATCH, DELETE) read from the primary throughout, so
+    the rows they modify are never loaded from a lagging replica.
+    """
+    replicas = sorted(key for key in app.config.get('SQLALCHEMY_BINDS') or {}
+                      if key.startswith(REPLICA_BIND_PREFIX))
+    if not replicas:
+        return
+    app.extensions['replica_cycle'] = itertools.cycle(replicas)
+    window = app.config.get('READ_YOUR_WRITES_SECONDS', 5)
+
+    @app.before_request
+    def check_recent_write():
+        try:
+            last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+        except ValueError:
+            last_write = 0
+        g.read_primary = request.method not in SAFE_METHODS or 0 <= time.time() - last_write < window
+
+    @app.after_request
+    def remember_write(response):
+        if g.get('wrote_primary'):
+            response.set_cookie(LAST_WRITE_COOKIE, f"{time.time():.3f}", max_age=window, httponly=True,
+                                samesite='Lax')
+        return response
@@ -0,0 +1,129 @@
+from .. import db
+from sqlalchemy import bindparam, case, column, delete, func, insert, select, table, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+# The pin columns the summary is derived from; a lightweight table avoids importing Pin
+pins = table('pins', column('author'), column('author_norm'), column('date_created'))
+
+# Dialect-specific INSERT constructs that support an upsert
+UPSERT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert, 'mysql': mysql.insert}
+
+
+class AuthorStats(db.Model):
+    """Per-author summary of pins: how many, and the first and last date_created.
+
+    Rows are keyed by the normalised author name and kept current by the Pin
+    write methods in the same transaction as the pin rows themselves, so
+    reading per-author aggregates costs one row per author instead of a scan
+    of pins. `rebuild` recomputes everything from pins to repair drift.
+    """
+    __tablename__ = 'author_stats'
+
+    author_norm = db.Column(db.String(100), primary_key=True)
+    author = db.Column(db.String(100), nullable=False)
+    pin_count = db.Column(db.Integer, nullable=False, default=0)
+    first_created = db.Column(db.DateTime, nullable=False)
+    last_created = db.Column(db.DateTime, nullable=False)
+
+    def to_dict(self):
+        return {
+            "author": self.author,
+            "pin_count": self.pin_count,
+            "first_created": self.first_created.isoformat(),
+            "last_created": self.last_created.isoformat()
+        }
+
+    @classmethod
+    async def get_page(cls, limit=20, after=None):
+        """Return (stats, has_more) ordered by normalised name, starting after the name `after`."""
+        stmt = select(cls).order_by(cls.author_norm).limit(limit + 1)
+        if after is not None:
+            stmt = stmt.where(cls.author_norm > after)
+        rows = list(db.session.scalars(stmt).all())
+        return rows[:limit], len(rows) > limit
+
+    @classmethod
+    async def get_by_author(cls, author_norm):
+        return db.session.get(cls, author_norm)
+
+    @classmethod
+    def record_added(cls, groups):
+        """Add pins to the summary without committing.
+
+        `groups` maps author_norm to (author, count, first_created, last_created)
+        for the pins just inserted (or moved to that author).
+        """
+        if not groups:
+            return
+        rows = [{"author_norm": norm, "author": author, "pin_count": count, "first_created": first,
+                 "last_created": last} for norm, (author, count, first, last) in groups.items()]
+        dialect = db.session.get_bind().dialect.name
+        stmt = UPSERT_INSERTS[dialect](cls.__table__).values(rows)
+        new = stmt.inserted if dialect == 'mysql' else stmt.excluded
+        table_ = cls.__table__.c
+        merged = {
+            "author": new.author,
+            "pin_count": table_.pin_count + new.pin_count,
+            "first_created": case((new.first_created < table_.first_created, new.first_created),
+                                  else_=table_.first_created),
+            "last_created": case((new.last_created > table_.last_created, new.last_created),
+                                 else_=table_.last_created)
+        }
+        if dialect == 'mysql':
+            stmt = stmt.on_duplicate_key_update(**merged)
+        else:
+            stmt = stmt.on_conflict_do_update(index_elements=['author_norm'], set_=merged)
+        db.session.execute(stmt)
+
+    @classmethod
+    def record_removed(cls, counts):
+        """Take pins out of the summary without committing.
+
+        `counts` maps author_norm to the number of pins deleted (or moved away).
+        Call it after the pin rows are gone: first/last dates are re-read from
+        the remaining pins through the (author_norm, date_created) index, and
+        authors left without pins are dropped.
+        """
+        if not counts:
+            return
+        table_ = cls.__table__
+        same_author = pins.c.author_norm == table_.c.author_norm
+        first = select(func.min(pins.c.date_created)).where(same_author).scalar_subquery()
+        last = select(func.max(pins.c.date_created)).where(same_author).scalar_subquery()
+        stmt = update(table_).where(table_.c.author_norm == bindparam('b_author_norm')).values(
+            pin_count=table_.c.pin_count - bindparam('b_count'),
+            first_created=func.coalesce(first, table_.c.first_created),
+            last_created=func.coalesce(last, table_.c.last_created)
+        )
+        db.session.execute(stmt, [{"b_author_norm": norm, "b_count": count} for norm, count in counts.items()])
+        db.session.execute(delete(table_).where(table_.c.pin_count <= 0))
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every row from the pins table in one transaction and return the number of authors."""
+        try:
+            db.session.execute(delete(cls.__table__))
+            summary = select(
+                pins.c.author_norm, func.max(pins.c.author), func.count(),
+                func.min(pins.c.date_created), func.max(pins.c.date_created)
+            ).group_by(pins.c.author_norm)
+            db.session.execute(insert(cls.__table__).from_select(
+                ['author_norm', 'author', 'pin_count', 'first_created', 'last_created'], summary))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return db.session.scalar(select(func.count()).select_from(cls.__table__))
+
+
+def summarize_pins(rows):
+    """Group (author, author_norm, date_created) tuples into record_added() input."""
+    groups = {}
+    for author, author_norm, date_created in rows:
+        current = groups.get(author_norm)
+        if current is None:
+            groups[author_norm] = (author, 1, date_created, date_created)
+        else:
+            _, count, first, last = current
+            groups[author_norm] = (author, count + 1, min(first, date_created), max(last, date_created))
+    return groups
@@ -1,9 +1,127 @@
+import asyncio
+import json
+import re
 from .. import db
+from .author_stats import AuthorStats, summarize_pins
+from ..utils.cache import LRUCache
+from ..utils.db_routing import reads_pinned_to_primary, reads_use_replica
+from ..utils.extensions import get_or_create_extension
+from ..utils.group_commit import GroupCommitQueue
+from collections import namedtuple
 from datetime import datetime
-from sqlalchemy import asc, desc
+from flask import current_app
+from sqlalchemy import (DDL, and_, asc, column, delete, desc, event, func, insert, literal_column,
+                        or_, select, table, text, update)
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import load_only, validates
+
+
+class VersionConflictError(Exception):
+    """Raised when a conditional update names a version the pin no longer has."""
+
+    def __init__(self, current_version):
+        super().__init__(f"Pin is at version {current_version}")
+        self.current_version = current_version
+
+
+def normalize_author(author):
+    """Case-fold an author name the same way SQL LOWER() does for the author_norm column."""
+    return author.lower()
+
+
+# Word tokens of a search query; anything else (FTS operators, quotes) is dropped
+SEARCH_TOKEN = re.compile(r'\w+')
+
+# SQLite keeps an external-content FTS5 index in sync with pins through triggers;
+# MySQL uses the FULLTEXT index declared on the model instead
+PINS_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS pins_fts USING fts5(title, body, content='pins', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS pins_fts_ai AFTER INSERT ON pins BEGIN "
+    "INSERT INTO pins_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS pins_fts_ad AFTER DELETE ON pins BEGIN "
+    "INSERT INTO pins_fts(pins_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS pins_fts_au AFTER UPDATE OF title, body ON pins BEGIN "
+    "INSERT INTO pins_fts(pins_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO pins_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+pins_fts = table('pins_fts', column('rowid'))
+
+# A serialised pin plus the validators needed for conditional requests
+CachedPin = namedtuple('CachedPin', ['payload', 'version', 'updated_at'])
+
+# Cheap fingerprint of a filtered collection: any insert, update or delete changes it (see get_collection_version)
+CollectionVersion = namedtuple('CollectionVersion', ['count', 'max_id', 'last_modified'])
+
+
+def get_pin_cache():
+    """Return the app's cache of serialised pin payloads, creating it from config on first use."""
+    cache = current_app.extensions.get('pin_cache')
+    if cache is None:
+        cache = LRUCache(
+            max_entries=current_app.config.get('PIN_CACHE_MAX_ENTRIES', 1024),
+            max_bytes=current_app.config.get('PIN_CACHE_MAX_BYTES', 16 * 1024 * 1024),
+            ttl=current_app.config.get('PIN_CACHE_TTL_SECONDS', 60),
+            size_of=lambda entry: len(entry.payload)
+        )
+        current_app.extensions['pin_cache'] = cache
+    return cache
+
+
+def get_count_cache():
+    """Return the app's cache of pin totals, creating it from config on first use.
+
+    Entries are dropped by this process's writes; COUNT_CACHE_TTL_SECONDS bounds
+    how long writes made by other processes can go unseen.
+    """
+    cache = current_app.extensions.get('count_cache')
+    if cache is None:
+        cache = LRUCache(
+            max_entries=current_app.config.get('COUNT_CACHE_MAX_ENTRIES', 4096),
+            ttl=current_app.config.get('COUNT_CACHE_TTL_SECONDS', 5)
+        )
+        current_app.extensions['count_cache'] = cache
+    return cache
+
+
+def get_pin_writer():
+    """Return the app's group-commit queue for new pins, or None unless PIN_WRITE_BEHIND is on.
+
+    The flusher thread inserts each batch with Pin.bulk_create in one
+    transaction and resolves every caller's future with its pin's id; a
+    batch that fails is retried row by row, so only the bad rows fail.
+    """
+    def create():
+        if not current_app.config.get('PIN_WRITE_BEHIND', False):
+            return None
+        app = current_app._get_current_object()
+
+        def flush(rows):
+            with app.app_context():
+                try:
+                    return asyncio.run(Pin.bulk_create(rows, chunk_size=len(rows)))
+                finally:
+                    db.session.remove()
+
+        return GroupCommitQueue(
+            flush,
+            max_rows=app.config.get('PIN_WRITE_BEHIND_MAX_ROWS', 100),
+            max_delay=app.config.get('PIN_WRITE_BEHIND_MAX_DELAY_MS', 5) / 1000,
+            max_queue=app.config.get('PIN_WRITE_BEHIND_QUEUE_SIZE', 1000),
+            name='pin-writer'
+        )
+
+    return get_or_create_extension('pin_writer', create)
+
 
 class Pin(db.Model):
     __tablename__ = 'pins'
+    __table_args__ = (
+        db.Index('ix_pins_author_norm_date_created_id', 'author_norm', 'date_created', 'id'),
+        db.Index('ix_pins_date_created', 'date_created'),
+        db.Index('ix_pins_updated_at', 'updated_at'),
+        db.Index('ix_pins_title_body_fulltext', 'title', 'body', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -11,32 +129,317 @@ class Pin(db.Model):
     image_link = db.Column(db.String(255), nullable=False)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     author = db.Column(db.String(100), nullable=False)
+    author_norm = db.Column(db.String(100), nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1)
+
+    @validates('author')
+    def _sync_author_norm(self, key, author):
+        self.author_norm = normalize_author(author)
+        return author
+
+    # Fields a client may select with ?fields=, in response order
+    FIELDS = ('id', 'title', 'body', 'image_link', 'date_created', 'author', 'updated_at', 'version')
+
+    # Columns every partial load still needs for cursors and ETags
+    KEY_FIELDS = ('id', 'date_created', 'updated_at', 'version')
 
-    def to_dict(self):
+    def to_dict(self, fields=None):
+        if fields is not None:
+            return {field: self._field_value(field) for field in fields}
         return {
             "id": self.id,
             "title": self.title,
             "body": self.body,
             "image_link": self.image_link,
             "date_created": self.date_created.isoformat(),
-            "author": self.author
+            "author": self.author,
+            "updated_at": self.updated_at.isoformat(),
+            "version": self.version
         }
 
+    def _field_value(self, field):
+        value = getattr(self, field)
+        return value.isoformat() if isinstance(value, datetime) else value
+
     @classmethod
-    async def get_all(cls, author_filter=None, order_dir='desc'):
-        query = cls.query
+    def load_fields(cls, fields):
+        """Loader option that reads only `fields` (plus KEY_FIELDS), leaving body and the rest deferred."""
+        columns = set(cls.KEY_FIELDS).union(fields)
+        return load_only(*(getattr(cls, column) for column in cls.FIELDS if column in columns))
+
+    @classmethod
+    def _filter_author(cls, query, author_filter):
         if author_filter:
-            query = query.filter(cls.author.ilike(author_filter))
+            query = query.filter(cls.author_norm == normalize_author(author_filter))
+        return query
+
+    @classmethod
+    async def get_all(cls, author_filter=None, order_dir='desc'):
+        query = cls._filter_author(cls.query, author_filter)
         
         order_func = desc if order_dir == 'desc' else asc
-        query = query.order_by(order_func(getattr(cls, 'date_created')))
+        # Ties keep insertion order regardless of direction, as they did before
+        # date_created was indexed
+        query = query.order_by(order_func(cls.date_created), asc(cls.id))
         
         return query.all()
 
+    @classmethod
+    def _page_query(cls, query, author_filter, order_dir, limit, after, backwards):
+        query = cls._filter_author(query, author_filter)
+
+        descending = (order_dir == 'desc') != backwards
+        if after is not None:
+            date_created, pin_id = after
+            if descending:
+                query = query.filter(or_(cls.date_created < date_created,
+                                         and_(cls.date_created == date_created, cls.id < pin_id)))
+            else:
+                query = query.filter(or_(cls.date_created > date_created,
+                                         and_(cls.date_created == date_created, cls.id > pin_id)))
+
+        order_func = desc if descending else asc
+        return query.order_by(order_func(cls.date_created), order_func(cls.id)).limit(limit + 1)
+
+    @staticmethod
+    def _trim_page(rows, limit, backwards):
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+        return rows, has_more
+
+    @classmethod
+    async def get_page(cls, author_filter=None, order_dir='desc', limit=20, after=None, backwards=False,
+                       fields=None):
+        """Fetch one keyset page ordered by (date_created, id).
+
+        `after` is the (date_created, id) key the page starts from (exclusive).
+        With `backwards` the page is read towards the start of the ordering,
+        which is how `prev` cursors are served. Returns (pins, has_more) where
+        has_more says whether rows remain beyond the page in the read direction.
+        With `fields` only those columns are selected.
+        """
+        query = cls._page_query(cls.query, author_filter, order_dir, limit, after, backwards)
+        if fields is not None:
+            query = query.options(cls.load_fields(fields))
+        return cls._trim_page(query.all(), limit, backwards)
+
+    @classmethod
+    async def get_page_versions(cls, author_filter=None, order_dir='desc', limit=20, after=None, backwards=False):
+        """Like get_page, but only reads (id, version, updated_at) rows for conditional requests."""
+        stmt = cls._page_query(select(cls.id, cls.version, cls.updated_at),
+                               author_filter, order_dir, limit, after, backwards)
+        return cls._trim_page(db.session.execute(stmt).all(), limit, backwards)
+
+    @classmethod
+    def iter_all(cls, author_filter=None, order_dir='desc', batch_size=500, session=None, fields=None):
+        """Yield every matching pin, fetching rows from a server-side cursor in batches.
+
+        Pass `session` to stream outside of an app context, e.g. from a response generator.
+        """
+        stmt = cls._filter_author(select(cls), author_filter)
+
+        order_func = desc if order_dir == 'desc' else asc
+        stmt = stmt.order_by(order_func(cls.date_created), order_func(cls.id))
+        if fields is not None:
+            stmt = stmt.options(cls.load_fields(fields))
+        stmt = stmt.execution_options(stream_results=True, yield_per=batch_size)
+
+        yield from (session or db.session).scalars(stmt)
+
+    @classmethod
+    async def search(cls, query_text, limit=20, offset=0):
+        """Full-text search over title and body, best matches first.
+
+        Every word in `query_text` must match. Returns (pins, has_more).
+        """
+        stmt = cls._search_query(query_text)
+        if stmt is None:
+            return [], False
+        pins = db.session.scalars(stmt.limit(limit + 1).offset(offset)).all()
+        return pins[:limit], len(pins) > limit
+
+    @classmethod
+    def _search_query(cls, query_text):
+        """Build the ranked search SELECT for the dialect in use, or None when the query has no words."""
+        terms = SEARCH_TOKEN.findall(query_text)
+        if not terms:
+            return None
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'sqlite':
+            stmt = (select(cls)
+                    .join(pins_fts, pins_fts.c.rowid == cls.id)
+                    .where(text("pins_fts MATCH :terms").bindparams(terms=' '.join(f'"{term}"' for term in terms)))
+                    .order_by(func.bm25(literal_column('pins_fts')), cls.id))
+        elif dialect == 'mysql':
+            score = mysql.match(cls.title, cls.body, against=' '.join(f'+{term}' for term in terms)).in_boolean_mode()
+            stmt = select(cls).where(score).order_by(desc(score), cls.id)
+        else:
+            stmt = select(cls).where(and_(*(or_(cls.title.ilike(f'%{term}%'), cls.body.ilike(f'%{term}%'))
+                                           for term in terms))).order_by(desc(cls.date_created), desc(cls.id))
+        return stmt
+
     @classmethod
     async def get_by_id(cls, pin_id):
         return db.session.get(Pin, pin_id)
 
+    @classmethod
+    async def get_payload_by_id(cls, pin_id, repository=None):
+        """Return the pin as a CachedPin of JSON bytes and validators, reading through the pin cache.
+
+        Cache misses load the row through `repository` (e.g. an AsyncPinRepository) when given.
+        Clients whose reads are pinned to the primary bypass the cache, and rows
+        read from a replica are served without being cached.
+        """
+        cache = get_pin_cache()
+        entry = None if reads_pinned_to_primary() else cache.get(pin_id)
+        if entry is None:
+            # Taken before the read, so a write committed meanwhile keeps the row out of the cache
+            generation = cache.generation()
+            from_replica = reads_use_replica()
+            if repository is not None:
+                pin = await repository.get_by_id(pin_id)
+            else:
+                pin = db.session.get(Pin, pin_id)
+            if not pin:
+                return None
+            entry = cls._pin_entry(pin) if from_replica else cls._cache_pin(cache, pin, generation)
+        return entry
+
+    @classmethod
+    def cache_generation(cls):
+        """Return the pin cache generation; take it before reading rows that will go to payloads_for()."""
+        return get_pin_cache().generation()
+
+    @classmethod
+    def payloads_for(cls, pins, generation=None):
+        """Return the serialised JSON fragment of each pin, reusing cached bytes of the same version.
+
+        Pins are only cached when nothing was invalidated since `generation`
+        (see cache_generation) and never over a newer cached version. Rows read
+        from a replica are not cached, and clients whose reads are pinned to the
+        primary do not reuse cached bytes.
+        """
+        cache = get_pin_cache()
+        pinned, from_replica = reads_pinned_to_primary(), reads_use_replica()
+        payloads = []
+        for pin in pins:
+            entry = None if pinned else cache.get(pin.id)
+            if entry is None or entry.version != pin.version:
+                entry = cls._pin_entry(pin) if from_replica else cls._cache_pin(cache, pin, generation)
+            payloads.append(entry.payload)
+        return payloads
+
+    @staticmethod
+    def _pin_entry(pin):
+        payload = current_app.json.dumps(pin.to_dict()).encode('utf-8')
+        return CachedPin(payload, pin.version, pin.updated_at)
+
+    @classmethod
+    def _cache_pin(cls, cache, pin, generation):
+        """Serialise `pin` and cache it unless the cache was invalidated after `generation` was taken.
+
+        A cached entry of a newer version is kept.
+        """
+        entry = cls._pin_entry(pin)
+        cache.set(pin.id, entry, generation=generation, replace=lambda old, new: new.version >= old.version)
+        return entry
+
+    @classmethod
+    async def get_fields_by_id(cls, pin_id, fields):
+        """Return (data, version, updated_at) with only `fields` of the pin.
+
+        A cached payload is projected when present; otherwise only the requested
+        columns are read and nothing is cached.
+        """
+        entry = None if reads_pinned_to_primary() else get_pin_cache().get(pin_id)
+        if entry is not None:
+            data = json.loads(entry.payload)
+            return {field: data[field] for field in fields}, entry.version, entry.updated_at
+        pin = db.session.scalars(select(cls).where(cls.id == pin_id).options(cls.load_fields(fields))).first()
+        if not pin:
+            return None
+        return pin.to_dict(fields), pin.version, pin.updated_at
+
+    @classmethod
+    async def get_validators(cls, pin_id):
+        """Return (version, updated_at) for a pin without loading or serialising its body."""
+        entry = None if reads_pinned_to_primary() else get_pin_cache().get(pin_id)
+        if entry is not None:
+            return entry.version, entry.updated_at
+        row = db.session.execute(
+            select(cls.version, cls.updated_at).where(cls.id == pin_id)
+        ).first()
+        return tuple(row) if row else None
+
+    @classmethod
+    async def get_collection_version(cls, author_filter=None):
+        """Return a CollectionVersion for all pins or one author's pins without scanning pins.
+
+        The count comes from the author summary, and MAX(id) / MAX(updated_at)
+        are taken over the whole table, each from the end of an index. Any
+        insert raises max_id, any update raises last_modified and any delete
+        changes the count, so the fingerprint always changes with the
+        collection; writes to other authors' pins change it too, which only
+        costs a 200 where a 304 would have done.
+        """
+        count, _ = await cls.count(author_filter=author_filter, exact=True)
+        max_id, last_modified = db.session.execute(select(func.max(cls.id), func.max(cls.updated_at))).one()
+        return CollectionVersion(count, max_id, last_modified)
+
+    @classmethod
+    async def count(cls, author_filter=None, exact=False):
+        """Return (total, is_exact) for all pins or one author's pins, read from the author summary.
+
+        The summary is maintained with the pins, so a fresh read is exact and
+        costs one row (one author) or one row per author (all pins). Unless
+        `exact` is set, totals are served from the count cache; a cached total
+        may miss other processes' latest writes, so it is reported as inexact.
+        So is a total read from a replica, which is not cached either; clients
+        whose reads are pinned to the primary skip the cache.
+        """
+        key = ('author', normalize_author(author_filter)) if author_filter else ('all',)
+        cache = get_count_cache()
+        if not exact and not reads_pinned_to_primary():
+            total = cache.get(key)
+            if total is not None:
+                return total, False
+        from_replica = reads_use_replica()
+        if author_filter:
+            total = db.session.scalar(select(AuthorStats.pin_count).where(AuthorStats.author_norm == key[1])) or 0
+        else:
+            total = db.session.scalar(select(func.coalesce(func.sum(AuthorStats.pin_count), 0)))
+        if from_replica:
+            return total, False
+        cache.set(key, total)
+        return total, True
+
+    @classmethod
+    async def search_count(cls, query_text, exact=False, cap=10000):
+        """Return (total, is_exact) for a search query.
+
+        An exact count scans every match. Otherwise counting stops after `cap`
+        matches: totals under the cap are still exact, larger ones are reported
+        as `cap` and flagged as inexact (a lower bound).
+        """
+        stmt = cls._search_query(query_text)
+        if stmt is None:
+            return 0, True
+        matches = stmt.order_by(None).with_only_columns(cls.id)
+        if not exact:
+            matches = matches.limit(cap + 1)
+        total = db.session.scalar(select(func.count()).select_from(matches.subquery()))
+        if not exact and total > cap:
+            return cap, False
+        return total, True
+
+    @classmethod
+    def cache_stats(cls):
+        return get_pin_cache().stats()
+
     @classmethod
     async def create(cls, pin_data):
         pin = cls(
@@ -47,26 +450,216 @@ class Pin(db.Model):
             date_created=pin_data["date_created"]
         )
         db.session.add(pin)
+        AuthorStats.record_added(summarize_pins([(pin.author, pin.author_norm, pin.date_created)]))
         db.session.commit()
+        get_count_cache().clear()
         return pin
 
+    @classmethod
+    async def bulk_create(cls, pins_data, chunk_size=1000, before_commit=None):
+        """Insert many pins in one transaction, chunk_size rows per statement.
+
+        `before_commit` is called inside the transaction just before it
+        commits, for work that must land atomically with the pins.
+
+        Returns the generated ids in input order. Dialects that can return ids
+        from an executemany (SQLite, PostgreSQL, MariaDB) get batched
+        INSERT ... RETURNING. MySQL gets one multi-row INSERT per chunk and
+        derives the ids from LAST_INSERT_ID() and the row count: InnoDB gives
+        the rows of a single multi-row INSERT consecutive ids (lock modes 1
+        and 2), spaced by auto_increment_increment.
+        """
+        dialect = db.session.get_bind().dialect
+        use_returning = dialect.insert_executemany_returning_sort_by_parameter_order
+        step = 1
+        if not use_returning and dialect.name == 'mysql':
+            step = db.session.scalar(text("SELECT @@auto_increment_increment"))
+        ids = []
+        try:
+            for start in range(0, len(pins_data), chunk_size):
+                rows = [{
+                    "title": data["title"],
+                    "body": data["body"],
+                    "image_link": data["image_link"],
+                    "author": data["author"],
+                    "author_norm": normalize_author(data["author"]),
+                    "date_created": data["date_created"],
+                    "updated_at": data["date_created"]
+                } for data in pins_data[start:start + chunk_size]]
+                if use_returning:
+                    stmt = insert(cls).returning(cls.id, sort_by_parameter_order=True)
+                    ids.extend(db.session.scalars(stmt, rows).all())
+                else:
+                    result = db.session.execute(insert(cls).values(rows))
+                    ids.extend(cls._inserted_ids(result, dialect.name, len(rows), step))
+            AuthorStats.record_added(summarize_pins(
+                (data["author"], normalize_author(data["author"]), data["date_created"]) for data in pins_data))
+            if before_commit is not None:
+                before_commit()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        get_count_cache().clear()
+        return ids
+
+    @staticmethod
+    def _inserted_ids(result, dialect_name, count, step):
+        """Return the ids of the `count` rows added by one multi-row INSERT without RETURNING."""
+        # MySQL reports the first generated id, SQLite the last one
+        first = result.lastrowid - (count - 1) * step if dialect_name == 'sqlite' else result.lastrowid
+        return range(first, first + count * step, step)
+
     @classmethod
     async def update(cls, pin_id, pin_data):
         pin = db.session.get(Pin, pin_id)
         if pin:
+            old_author_norm = pin.author_norm
             pin.title = pin_data["title"]
             pin.body = pin_data["body"]
             pin.image_link = pin_data["image_link"]
             pin.author = pin_data["author"]
+            pin.updated_at = datetime.utcnow()
+            pin.version += 1
+            moved = pin.author_norm != old_author_norm
+            if moved:
+                db.session.flush()
+                cls._move_author_stats({old_author_norm: (1, pin.date_created, pin.date_created)}, pin.author)
             db.session.commit()
+            get_pin_cache().invalidate(pin_id)
+            if moved:
+                get_count_cache().clear()
             return pin
         return None
 
+    @classmethod
+    async def patch(cls, pin_id, changes, version):
+        """Apply `changes` only if the pin is still at `version`, in one conditional UPDATE.
+
+        Returns the new (version, updated_at), None when the pin does not exist,
+        and raises VersionConflictError when someone else updated it first.
+        """
+        values = dict(changes)
+        previous = None
+        if "author" in values:
+            values["author_norm"] = normalize_author(values["author"])
+            # Only an author change pays for reading the old one, for the author summary
+            previous = db.session.execute(select(cls.author_norm, cls.date_created)
+                                          .where(cls.id == pin_id, cls.version == version)).first()
+        updated_at = datetime.utcnow()
+        values["updated_at"] = updated_at
+        values["version"] = version + 1
+
+        stmt = update(cls).where(cls.id == pin_id, cls.version == version).values(**values)
+        result = db.session.execute(stmt.execution_options(synchronize_session=False))
+        moved = result.rowcount == 1 and previous is not None and previous.author_norm != values["author_norm"]
+        if moved:
+            cls._move_author_stats({previous.author_norm: (1, previous.date_created, previous.date_created)},
+                                   values["author"])
+        db.session.commit()
+        if moved:
+            get_count_cache().clear()
+        if result.rowcount == 1:
+            get_pin_cache().invalidate(pin_id)
+            return version + 1, updated_at
+
+        # Only the failure path pays for a second query, to tell 404 from 409
+        current = db.session.scalar(select(cls.version).where(cls.id == pin_id))
+        if current is None:
+            return None
+        raise VersionConflictError(current)
+
     @classmethod
     async def delete(cls, pin_id):
         pin = db.session.get(Pin, pin_id)
         if pin:
             db.session.delete(pin)
+            db.session.flush()
+            AuthorStats.record_removed({pin.author_norm: 1})
             db.session.commit()
+            get_pin_cache().invalidate(pin_id)
+            get_count_cache().clear()
             return True
-        return False
\ No newline at end of file
+        return False
+
+    @classmethod
+    def _filter_batch(cls, stmt, ids=None, author=None, created_after=None, created_before=None):
+        """Add the batch selector to `stmt`; refuses an empty selector rather than matching every pin."""
+        if ids is None and author is None and created_after is None and created_before is None:
+            raise ValueError("A batch needs ids or at least one filter")
+        if ids is not None:
+            stmt = stmt.where(cls.id.in_(ids))
+        if author is not None:
+            stmt = stmt.where(cls.author_norm == normalize_author(author))
+        if created_after is not None:
+            stmt = stmt.where(cls.date_created >= created_after)
+        if created_before is not None:
+            stmt = stmt.where(cls.date_created < created_before)
+        return stmt
+
+    @classmethod
+    def _author_groups(cls, ids=None, author=None, created_after=None, created_before=None):
+        """Map author_norm to (count, first date_created, last date_created) for the pins a batch will touch."""
+        stmt = select(cls.author_norm, func.count(), func.min(cls.date_created), func.max(cls.date_created))
+        stmt = cls._filter_batch(stmt, ids, author, created_after, created_before).group_by(cls.author_norm)
+        return {norm: (count, first, last) for norm, count, first, last in db.session.execute(stmt)}
+
+    @staticmethod
+    def _move_author_stats(groups, new_author):
+        """Move pins described by _author_groups() output to new_author in the author summary."""
+        AuthorStats.record_removed({norm: count for norm, (count, _, _) in groups.items()})
+        AuthorStats.record_added({normalize_author(new_author): (
+            new_author,
+            sum(count for count, _, _ in groups.values()),
+            min(first for _, first, _ in groups.values()),
+            max(last for _, _, last in groups.values())
+        )})
+
+    @staticmethod
+    def _invalidate_batch(ids):
+        cache = get_pin_cache()
+        if ids is None:
+            cache.clear()
+        else:
+            for pin_id in ids:
+                cache.invalidate(pin_id)
+
+    @classmethod
+    async def bulk_update(cls, changes, ids=None, author=None, created_after=None, created_before=None):
+        """Apply `changes` to every matching pin with one UPDATE statement and return the row count.
+
+        At least one of ids, author, created_after or created_before is required.
+        """
+        values = dict(changes)
+        if "author" in values:
+            values["author_norm"] = normalize_author(values["author"])
+        values["updated_at"] = datetime.utcnow()
+        values["version"] = cls.version + 1
+
+        moved = cls._author_groups(ids, author, created_after, created_before) if "author" in values else None
+        stmt = cls._filter_batch(update(cls), ids, author, created_after, created_before)
+        result = db.session.execute(stmt.values(**values).execution_options(synchronize_session=False))
+        if moved:
+            cls._move_author_stats(moved, values["author"])
+        db.session.commit()
+        cls._invalidate_batch(ids)
+        if moved:
+            get_count_cache().clear()
+        return result.rowcount
+
+    @classmethod
+    async def bulk_delete(cls, ids=None, author=None, created_after=None, created_before=None):
+        """Delete every matching pin with one DELETE statement and return the row count."""
+        removed = cls._author_groups(ids, author, created_after, created_before)
+        stmt = cls._filter_batch(delete(cls), ids, author, created_after, created_before)
+        result = db.session.execute(stmt.execution_options(synchronize_session=False))
+        AuthorStats.record_removed({norm: count for norm, (count, _, _) in removed.items()})
+        db.session.commit()
+        cls._invalidate_batch(ids)
+        get_count_cache().clear()
+        return result.rowcount
+
+
+for statement in PINS_FTS_DDL:
+    event.listen(Pin.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(Pin.__table__, 'before_drop', DDL("DROP TABLE IF EXISTS pins_fts").execute_if(dialect='sqlite'))
@@ -0,0 +1,32 @@
+from .. import db
+from datetime import datetime
+from sqlalchemy import delete
+
+
+class PinImport(db.Model):
+    """Progress of a `flask pins import`, keyed by the absolute path of the input file.
+
+    The row is written in the same transaction as each chunk of pins (see
+    Pin.bulk_create's before_commit), so the recorded offset always matches
+    what was committed and a resumed import never inserts a row twice.
+    """
+    __tablename__ = 'pin_imports'
+
+    source = db.Column(db.String(512), primary_key=True)
+    byte_offset = db.Column(db.BigInteger, nullable=False)
+    row_count = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    @classmethod
+    def get(cls, source):
+        return db.session.get(cls, source)
+
+    @classmethod
+    def record(cls, source, byte_offset, row_count):
+        """Save the byte offset after the last imported record, without committing."""
+        db.session.merge(cls(source=source, byte_offset=byte_offset, row_count=row_count, updated_at=datetime.utcnow()))
+
+    @classmethod
+    def clear(cls, source):
+        db.session.execute(delete(cls).where(cls.source == source))
+        db.session.commit()
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from .pin import Pin
+from ..utils.db_pool import pool_engine_options
+from ..utils.extensions import get_or_create_extension
+
+
+class AsyncPinRepository:
+    """Pin reads on SQLAlchemy's asyncio engine.
+
+    get_page and get_by_id mirror the Pin classmethods of the same name, so
+    callers can await either. Every await on the database yields to the
+    event loop instead of blocking it.
+
+    Flask runs each async view in its own short-lived event loop and asyncio
+    connections cannot move between loops, so the engine lives on one
+    long-running loop in a background thread and callers await its results
+    from whichever loop they are on. That keeps the connection pool (sized by
+    `engine_options`) shared across requests.
+
+    The repository is read-only: writes go through the Pin classmethods,
+    which keep the pin cache, the count cache and the author summary in step.
+    """
+
+    def __init__(self, url, **engine_options):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='pin-repository', daemon=True)
+        self._thread.start()
+        self.engine = create_async_engine(url, **engine_options)
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    def _run(self, coro):
+        """Run `coro` on the repository loop and return an awaitable for the caller's loop."""
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    async def get_page(self, author_filter=None, order_dir='desc', limit=20, after=None, backwards=False,
+                       fields=None):
+        stmt = Pin._page_query(select(Pin), author_filter, order_dir, limit, after, backwards)
+        if fields is not None:
+            stmt = stmt.options(Pin.load_fields(fields))
+        pins = await self._run(self._scalars(stmt))
+        return Pin._trim_page(pins, limit, backwards)
+
+    async def get_by_id(self, pin_id):
+        return await self._run(self._get(pin_id))
+
+    async def _scalars(self, stmt):
+        async with self.sessionmaker() as session:
+            return list((await session.scalars(stmt)).all())
+
+    async def _get(self, pin_id):
+        async with self.sessionmaker() as session:
+            return await session.get(Pin, pin_id)
+
+    async def dispose(self):
+        await self._run(self.engine.dispose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        await asyncio.to_thread(self._thread.join)
+        self._loop.close()
+
+
+def get_pin_repository():
+    """Return the app's async pin repository, or None when ASYNC_DATABASE_URI is not set.
+
+    Outside SQLite the pool is sized from the same DB_POOL_* settings as the
+    sync engine; the asyncio engine keeps its own async-adapted pool class.
+    """
+    def create():
+        url = current_app.config.get('ASYNC_DATABASE_URI')
+        if not url:
+            return None
+        options = {}
+        if not url.startswith('sqlite'):
+            options = {key: value for key, value in pool_engine_options(current_app.config).items()
+                       if key != 'poolclass'}
+        return AsyncPinRepository(url, **options)
+
+    return get_or_create_extension('pin_repository', create)
@@ -1,4 +1,5 @@
 from .. import db
+from ..utils.hashing_pool import get_hashing_pool
 import hashlib
 import hmac
 import os
@@ -19,7 +20,7 @@ class User(db.Model):
     def create(cls, username, password):
         user = cls(
             username=username,
-            password_hash=cls.generate_password_hash(password)
+            password_hash=get_hashing_pool().run(cls.generate_password_hash, password)
         )
         db.session.add(user)
         db.session.commit()
@@ -35,6 +36,11 @@ class User(db.Model):
         key_b64 = base64.b64encode(key).decode('ascii')
         return f"pbkdf2-sha256${salt_b64}${iterations}${key_b64}"
 
+    @classmethod
+    def check_password(cls, stored_hash, password):
+        """Run verify_password on the hashing pool instead of the request thread."""
+        return get_hashing_pool().run(cls.verify_password, stored_hash, password)
+
     @staticmethod
     def verify_password(stored_hash, password):
         """Verify a password against the stored hash."""
@@ -0,0 +1,27 @@
+from flask import Blueprint, request, jsonify, abort
+from ..models.author_stats import AuthorStats
+from ..models.pin import normalize_author
+from ..utils.pagination import parse_limit
+
+authors_bp = Blueprint('authors', __name__)
+
+# GET authors with their pin counts, one page at a time in name order
+@authors_bp.route('/authors', methods=['GET'])
+async def get_authors():
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        abort(400, description=str(e))
+    after = request.args.get('after')
+    stats, has_more = await AuthorStats.get_page(limit, normalize_author(after) if after else None)
+    next_after = stats[-1].author_norm if has_more else None
+    return jsonify({"data": [row.to_dict() for row in stats], "count": len(stats), "limit": limit,
+                    "next": next_after}), 200
+
+# GET pin count and first/last pin dates of one author
+@authors_bp.route('/authors/<name>/stats', methods=['GET'])
+async def get_author_stats(name):
+    stats = await AuthorStats.get_by_author(normalize_author(name))
+    if stats is None:
+        abort(404, description="Author not found")
+    return jsonify({"data": stats.to_dict()}), 200
@@ -0,0 +1,32 @@
+from flask import Blueprint, Response, abort, jsonify
+from .. import db
+from ..middleware.admission import admission_status
+from ..middleware.auth import require_api_key
+from ..middleware.metrics import PROMETHEUS_CONTENT_TYPE, get_metrics
+from ..utils.db_pool import pool_status
+
+internal_bp = Blueprint('internal', __name__)
+
+# GET live database connection pool metrics
+@internal_bp.route('/pool', methods=['GET'])
+@require_api_key
+def get_pool_status():
+    return jsonify({"data": pool_status(db.engine)}), 200
+
+# GET admission control state per route group
+@internal_bp.route('/admission', methods=['GET'])
+@require_api_key
+def get_admission_status():
+    status = admission_status()
+    if status is None:
+        abort(404, description="Admission control is disabled")
+    return jsonify({"data": status}), 200
+
+# GET request metrics in the Prometheus text format
+@internal_bp.route('/metrics', methods=['GET'])
+@require_api_key
+def get_request_metrics():
+    metrics = get_metrics()
+    if metrics is None:
+        abort(404, description="Metrics are disabled")
+    return Response(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
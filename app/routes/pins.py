@@ -1,11 +1,148 @@
-from flask import Blueprint, request, jsonify, abort
-from ..models.pin import Pin
+import asyncio
+import json
+from flask import Blueprint, Response, current_app, g, request, jsonify, abort
+from sqlalchemy.orm import Session
+from .. import db
+from ..models.pin import Pin, VersionConflictError, get_pin_writer, normalize_author
+from ..models.pin_repository import get_pin_repository
 from datetime import datetime
 from ..middleware.auth import authenticate
+from ..utils.conditional import (has_conditional_headers, is_not_modified, make_etag,
+                                 not_modified_response, set_validators)
+from ..utils.group_commit import QueueFullError
+from ..utils.json_provider import join_fragments
+from ..utils.pagination import decode_cursor, encode_cursor, parse_limit
 
 pins_bp = Blueprint('pins', __name__)
 
-# GET all pins with filtering and ordering
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 500
+REQUIRED_FIELDS = ['title', 'body', 'image_link', 'author']
+MAX_SEARCH_OFFSET = 10000
+BATCH_FILTER_FIELDS = ['author', 'created_after', 'created_before']
+WRITE_RETRY_AFTER = 1
+TOTAL_MODES = ('exact', 'estimate')
+
+
+def parse_fields():
+    """Parse the `fields` query parameter into a tuple of Pin fields, or None for all of them."""
+    value = request.args.get('fields')
+    if not value:
+        return None
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in Pin.FIELDS]
+    if unknown or not fields:
+        abort(400, description=f"fields must be a comma-separated subset of: {list(Pin.FIELDS)}")
+    return tuple(field for field in Pin.FIELDS if field in fields)
+
+
+def parse_total():
+    """Parse the `total` query parameter: None (no total), 'exact' or 'estimate'."""
+    value = request.args.get('total')
+    if value is None:
+        return None
+    if value not in TOTAL_MODES:
+        abort(400, description=f"total must be one of {list(TOTAL_MODES)}")
+    return value
+
+
+def has_required_fields(data):
+    return isinstance(data, dict) and all(field in data for field in REQUIRED_FIELDS)
+
+
+def invalid_values(changes):
+    """Return the fields of `changes` whose value is not a non-empty string."""
+    return [field for field, value in changes.items() if not isinstance(value, str) or not value]
+
+
+def read_batch_body():
+    """Parse a batch request body given either as a JSON array or as NDJSON."""
+    if request.mimetype == NDJSON_MIMETYPE:
+        items = []
+        for line_no, line in enumerate(request.get_data(as_text=True).splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                abort(400, description=f"Invalid JSON on line {line_no}")
+        return items
+
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        abort(400, description="Request body must be a JSON array or NDJSON")
+    return items
+
+
+def read_batch_selector(body):
+    """Turn the `ids` list or `filter` object of a batch request into bulk_update/bulk_delete kwargs."""
+    ids = body.get("ids")
+    predicate = body.get("filter")
+    if (ids is None) == (predicate is None):
+        abort(400, description="Provide exactly one of 'ids' or 'filter'")
+
+    if ids is not None:
+        if not isinstance(ids, list) or not ids or not all(isinstance(pin_id, int) for pin_id in ids):
+            abort(400, description="ids must be a non-empty list of integers")
+        return {"ids": ids}
+
+    if not isinstance(predicate, dict) or not predicate or set(predicate) - set(BATCH_FILTER_FIELDS):
+        abort(400, description=f"filter must use one or more of: {BATCH_FILTER_FIELDS}")
+    selector = {}
+    if "author" in predicate:
+        if not isinstance(predicate["author"], str) or not predicate["author"]:
+            abort(400, description="filter.author must be a non-empty string")
+        selector["author"] = predicate["author"]
+    for field in ('created_after', 'created_before'):
+        if field in predicate:
+            try:
+                selector[field] = datetime.fromisoformat(predicate[field])
+            except (TypeError, ValueError):
+                abort(400, description=f"filter.{field} must be an ISO 8601 datetime")
+    return selector
+
+
+def wants_stream():
+    """Return True when the client asked for the NDJSON streaming mode."""
+    if request.args.get('stream') in ('1', 'true'):
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def stream_pins(author, order_dir, fields=None):
+    """Build an NDJSON response that serialises pins as they are read from the database.
+
+    Async views run outside the request context that consumes the response, so
+    stream_with_context cannot be used; the generator opens its own session on
+    the engine instead.
+    """
+    app = current_app._get_current_object()
+    engine = db.engine
+
+    def generate():
+        with Session(engine) as session:
+            for pin in Pin.iter_all(author_filter=author, order_dir=order_dir,
+                                    batch_size=STREAM_BATCH_SIZE, session=session, fields=fields):
+                yield app.json.dumps(pin.to_dict(fields)) + '\n'
+
+    return Response(generate(), mimetype=NDJSON_MIMETYPE)
+
+
+def page_validators(rows, has_more, total=None):
+    """Build (etag, last_modified) for a page from its rows' ids and versions.
+
+    When the response carries a total, the total is part of the ETag and no
+    Last-Modified is given: rows outside the page change the total without
+    touching the page's own timestamps.
+    """
+    etag = make_etag('pins', request.query_string.decode(), has_more, total,
+                     *(f"{row.id}.{row.version}" for row in rows))
+    if total is not None:
+        return etag, None
+    last_modified = max((row.updated_at for row in rows), default=None)
+    return etag, last_modified
+
+# GET pins with filtering, ordering and cursor pagination
 @pins_bp.route('/pins', methods=['GET'])
 async def get_pins():
     author = request.args.get('author')
@@ -13,19 +150,122 @@ async def get_pins():
 
     if order_dir not in ['asc', 'desc']:
         abort(400, description="order_dir must be 'asc' or 'desc'")
+    fields = parse_fields()
 
-    pins = await Pin.get_all(author_filter=author, order_dir=order_dir)
-    pins_data = [pin.to_dict() for pin in pins]
+    if wants_stream():
+        collection = await Pin.get_collection_version(author_filter=author)
+        etag = make_etag('pins-stream', request.query_string.decode(), *collection)
+        if is_not_modified(etag, collection.last_modified):
+            return not_modified_response(etag, collection.last_modified)
+        return set_validators(stream_pins(author, order_dir, fields), etag, collection.last_modified)
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        abort(400, description=str(e))
+    total_mode = parse_total()
+
+    after, backwards = None, False
+    cursor_author = normalize_author(author) if author else None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            after, direction = decode_cursor(cursor, order_dir, cursor_author)
+        except ValueError:
+            abort(400, description="Invalid cursor for this order_dir and author")
+        backwards = direction == 'prev'
+
+    extra = {}
+    if total_mode is not None:
+        total, exact = await Pin.count(author_filter=author, exact=total_mode == 'exact')
+        extra = {"total": total, "total_exact": exact}
+
+    if has_conditional_headers():
+        rows, has_more = await Pin.get_page_versions(author_filter=author, order_dir=order_dir, limit=limit,
+                                                     after=after, backwards=backwards)
+        etag, last_modified = page_validators(rows, has_more, extra.get("total"))
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+    source = get_pin_repository() or Pin
+    generation = Pin.cache_generation()
+    pins, has_more = await source.get_page(author_filter=author, order_dir=order_dir, limit=limit,
+                                           after=after, backwards=backwards, fields=fields)
+
+    has_next = has_more if not backwards else True
+    has_prev = has_more if backwards else after is not None
+    next_cursor = prev_cursor = None
+    if pins and has_next:
+        next_cursor = encode_cursor(pins[-1].date_created, pins[-1].id, 'next', order_dir, cursor_author)
+    if pins and has_prev:
+        prev_cursor = encode_cursor(pins[0].date_created, pins[0].id, 'prev', order_dir, cursor_author)
 
-    return jsonify({"data": pins_data, "count": len(pins_data)}), 200
+    if fields is None:
+        fragments = Pin.payloads_for(pins, generation)
+    else:
+        fragments = [current_app.json.dumps(pin.to_dict(fields)).encode('utf-8') for pin in pins]
+    body = join_fragments(current_app.json.dumps, fragments,
+                          count=len(pins), limit=limit, next=next_cursor, prev=prev_cursor, **extra)
+    response = Response(body, status=200, mimetype='application/json')
+    return set_validators(response, *page_validators(pins, has_more, extra.get("total")))
+
+# GET pins matching a full-text query, best matches first
+@pins_bp.route('/pins/search', methods=['GET'])
+async def search_pins():
+    query_text = request.args.get('q', '').strip()
+    if not query_text:
+        abort(400, description="q is required")
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        offset = int(request.args.get('offset', 0))
+    except ValueError as e:
+        abort(400, description=str(e))
+    if offset < 0 or offset > MAX_SEARCH_OFFSET:
+        abort(400, description=f"offset must be between 0 and {MAX_SEARCH_OFFSET}")
+
+    total_mode = parse_total()
+
+    pins, has_more = await Pin.search(query_text, limit=limit, offset=offset)
+    pins_data = [pin.to_dict() for pin in pins]
+    result = {
+        "data": pins_data,
+        "count": len(pins_data),
+        "limit": limit,
+        "offset": offset,
+        "next_offset": offset + limit if has_more else None
+    }
+    if total_mode is not None:
+        total, exact = await Pin.search_count(query_text, exact=total_mode == 'exact',
+                                              cap=current_app.config.get('COUNT_ESTIMATE_CAP', 10000))
+        result.update(total=total, total_exact=exact)
+    return jsonify(result), 200
 
 # GET a single pin by ID
 @pins_bp.route('/pins/<int:pin_id>', methods=['GET'])
 async def get_pin(pin_id):
-    pin = await Pin.get_by_id(pin_id)
-    if not pin:
+    fields = parse_fields()
+    if has_conditional_headers():
+        validators = await Pin.get_validators(pin_id)
+        if validators is None:
+            abort(404, description="Pin not found")
+        version, updated_at = validators
+        etag = make_etag('pin', pin_id, version, fields)
+        if is_not_modified(etag, updated_at):
+            return not_modified_response(etag, updated_at)
+
+    if fields is not None:
+        found = await Pin.get_fields_by_id(pin_id, fields)
+        if found is None:
+            abort(404, description="Pin not found")
+        data, version, updated_at = found
+        return set_validators(jsonify({"data": data}), make_etag('pin', pin_id, version, fields), updated_at), 200
+
+    cached = await Pin.get_payload_by_id(pin_id, repository=get_pin_repository())
+    if cached is None:
         abort(404, description="Pin not found")
-    return jsonify({"data": pin.to_dict()}), 200
+    response = Response(b'{"data":' + cached.payload + b'}', status=200, mimetype='application/json')
+    return set_validators(response, make_etag('pin', pin_id, cached.version, None), cached.updated_at)
 
 # POST to create a new pin
 @pins_bp.route('/pins', methods=['POST'])
@@ -34,9 +274,11 @@ async def create_pin():
     if not request.json:
         abort(400, description="Request body must be JSON")
     
-    required_fields = ['title', 'body', 'image_link', 'author']
-    if not all(field in request.json for field in required_fields):
-        abort(400, description=f"Missing required fields: {required_fields}")
+    if not has_required_fields(request.json):
+        abort(400, description=f"Missing required fields: {REQUIRED_FIELDS}")
+    invalid = invalid_values({field: request.json[field] for field in REQUIRED_FIELDS})
+    if invalid:
+        abort(400, description=f"Fields must be non-empty strings: {invalid}")
 
     pin_data = {
         "title": request.json["title"],
@@ -45,9 +287,83 @@ async def create_pin():
         "author": request.json["author"],
         "date_created": datetime.utcnow()
     }
-    pin = await Pin.create(pin_data)
+    writer = get_pin_writer()
+    if writer is None:
+        pin = await Pin.create(pin_data)
+        return jsonify({"data": pin.to_dict()}), 201
+
+    # Group commit: the id arrives once the batch holding this pin is committed
+    try:
+        pin_id = await asyncio.wrap_future(writer.submit(pin_data))
+    except QueueFullError:
+        abort(503, description="Too many pending writes, retry shortly", retry_after=WRITE_RETRY_AFTER)
+    # The insert ran on the flusher thread, so this request never touched the primary itself
+    g.wrote_primary = True
+    pin = Pin(id=pin_id, updated_at=pin_data["date_created"], version=1, **pin_data)
     return jsonify({"data": pin.to_dict()}), 201
 
+# POST to create many pins in one transaction
+@pins_bp.route('/pins/batch', methods=['POST'])
+@authenticate
+async def create_pins_batch():
+    items = read_batch_body()
+    if not items:
+        abort(400, description="Batch must contain at least one pin")
+    max_items = current_app.config.get('PIN_BATCH_MAX_ITEMS', 10000)
+    if len(items) > max_items:
+        abort(400, description=f"Batch must not contain more than {max_items} pins")
+
+    invalid = [index for index, item in enumerate(items) if not has_required_fields(item)
+               or invalid_values({field: item[field] for field in REQUIRED_FIELDS})]
+    if invalid:
+        return jsonify({
+            "error": "Bad Request",
+            "message": f"Every pin needs non-empty string fields: {REQUIRED_FIELDS}",
+            "results": [{"index": index, "status": "invalid"} for index in invalid]
+        }), 400
+
+    now = datetime.utcnow()
+    pins_data = [{
+        "title": item["title"],
+        "body": item["body"],
+        "image_link": item["image_link"],
+        "author": item["author"],
+        "date_created": now
+    } for item in items]
+    ids = await Pin.bulk_create(pins_data, chunk_size=current_app.config.get('PIN_BATCH_CHUNK_SIZE', 1000))
+
+    results = [{"index": index, "status": "created", "id": pin_id} for index, pin_id in enumerate(ids)]
+    return jsonify({"data": results, "count": len(results)}), 201
+
+# PATCH many pins with one set-based UPDATE
+@pins_bp.route('/pins/batch', methods=['PATCH'])
+@authenticate
+async def update_pins_batch():
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        abort(400, description="Request body must be JSON")
+
+    changes = body.get("changes")
+    if not isinstance(changes, dict) or not changes or set(changes) - set(REQUIRED_FIELDS):
+        abort(400, description=f"changes must set one or more of: {REQUIRED_FIELDS}")
+    invalid = invalid_values(changes)
+    if invalid:
+        abort(400, description=f"changes must be non-empty strings: {invalid}")
+
+    updated = await Pin.bulk_update(changes, **read_batch_selector(body))
+    return jsonify({"message": "Pins updated", "count": updated}), 200
+
+# DELETE many pins with one set-based DELETE
+@pins_bp.route('/pins/batch', methods=['DELETE'])
+@authenticate
+async def delete_pins_batch():
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        abort(400, description="Request body must be JSON")
+
+    deleted = await Pin.bulk_delete(**read_batch_selector(body))
+    return jsonify({"message": "Pins deleted", "count": deleted}), 200
+
 # PUT to update a pin
 @pins_bp.route('/pins/<int:pin_id>', methods=['PUT'])
 @authenticate
@@ -57,6 +373,9 @@ async def update_pin(pin_id):
         abort(404, description="Pin not found")
     if not request.json:
         abort(400, description="Request body must be JSON")
+    invalid = invalid_values({field: request.json[field] for field in REQUIRED_FIELDS if field in request.json})
+    if invalid:
+        abort(400, description=f"Fields must be non-empty strings: {invalid}")
 
     pin_data = {
         "title": request.json.get("title", pin.title),
@@ -69,6 +388,35 @@ async def update_pin(pin_id):
         abort(404, description="Pin not found")
     return jsonify({"data": pin.to_dict()}), 200
 
+# PATCH changed fields of a pin, guarded by its version
+@pins_bp.route('/pins/<int:pin_id>', methods=['PATCH'])
+@authenticate
+async def patch_pin(pin_id):
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        abort(400, description="Request body must be JSON")
+
+    version = body.get("version")
+    if not isinstance(version, int) or isinstance(version, bool):
+        abort(400, description="version must be the integer version of the pin being changed")
+    changes = {field: value for field, value in body.items() if field != "version"}
+    if not changes or set(changes) - set(REQUIRED_FIELDS):
+        abort(400, description=f"Provide one or more of: {REQUIRED_FIELDS}")
+    invalid = invalid_values(changes)
+    if invalid:
+        abort(400, description=f"Fields must be non-empty strings: {invalid}")
+
+    try:
+        patched = await Pin.patch(pin_id, changes, version)
+    except VersionConflictError as e:
+        abort(409, description=f"Version conflict: pin is at version {e.current_version}")
+    if patched is None:
+        abort(404, description="Pin not found")
+
+    new_version, updated_at = patched
+    data = {"id": pin_id, **changes, "updated_at": updated_at.isoformat(), "version": new_version}
+    return set_validators(jsonify({"data": data}), make_etag('pin', pin_id, new_version, None), updated_at), 200
+
 # DELETE a pin
 @pins_bp.route('/pins/<int:pin_id>', methods=['DELETE'])
 @authenticate
@@ -1,9 +1,17 @@
 from flask import Blueprint, request, jsonify, abort
 from ..models.user import User
+from ..utils.hashing_pool import PoolSaturatedError
 from ..utils.jwt_utils import create_jwt_token, verify_jwt_token
 
 users_bp = Blueprint('users', __name__)
 
+HASHING_RETRY_AFTER = 1
+
+
+def hashing_pool_saturated():
+    abort(503, description="Too many password operations in progress, retry shortly",
+          retry_after=HASHING_RETRY_AFTER)
+
 # Register a new user
 @users_bp.route('/register', methods=['POST'])
 def register():
@@ -20,7 +28,10 @@ def register():
     if User.get_by_username(username):
         abort(400, description="Username already exists")
 
-    user = User.create(username, password)
+    try:
+        user = User.create(username, password)
+    except PoolSaturatedError:
+        hashing_pool_saturated()
     return jsonify({"message": "User registered successfully", "username": user.username}), 201
 
 # Obtain access and refresh tokens
@@ -37,7 +48,11 @@ def login():
     password = request.json['password']
 
     user = User.get_by_username(username)
-    if not user or not User.verify_password(user.password_hash, password):
+    try:
+        valid = user is not None and User.check_password(user.password_hash, password)
+    except PoolSaturatedError:
+        hashing_pool_saturated()
+    if not valid:
         abort(401, description="Invalid username or password")
 
     access_token = create_jwt_token(user.id, token_type='access')
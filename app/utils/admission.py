@@ -0,0 +1,90 @@
+import threading
+
+
+class ConcurrencyLimiter:
+    """Caps how many requests of one group run at once, with a short bounded wait queue.
+
+    acquire() admits immediately while fewer than `limit` requests are
+    running. Otherwise up to `max_queue` callers wait at most `queue_timeout`
+    seconds for a slot, and everyone else is turned away at once, so admitted
+    requests keep their latency instead of all of them slowing down together.
+
+    In adaptive mode the limit follows observed latency: after every `window`
+    completed requests, a mean latency above `target_latency` cuts the limit
+    by a quarter (never below `min_limit`), and a mean under it raises the
+    limit by one (never above `max_limit`, the configured limit).
+    """
+
+    def __init__(self, limit, max_queue=32, queue_timeout=0.1, adaptive=False, target_latency=0.25,
+                 min_limit=1, window=50):
+        self.limit = limit
+        self.max_limit = limit
+        self.min_limit = min(min_limit, limit)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.adaptive = adaptive
+        self.target_latency = target_latency
+        self.window = window
+        self._condition = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._window_total = 0.0
+        self._window_count = 0
+
+    def acquire(self):
+        """Take a slot, waiting briefly if needed; return False when the request should be shed."""
+        with self._condition:
+            if self.active < self.limit:
+                return self._admit()
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+            try:
+                admitted = self._condition.wait_for(lambda: self.active < self.limit, self.queue_timeout)
+            finally:
+                self.waiting -= 1
+            if not admitted:
+                self.rejected += 1
+                return False
+            return self._admit()
+
+    def release(self, latency):
+        """Free the slot of a request that took `latency` seconds once admitted."""
+        with self._condition:
+            self.active -= 1
+            if self.adaptive:
+                self._observe(latency)
+            self._condition.notify()
+
+    def stats(self):
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "max_limit": self.max_limit,
+                "active": self.active,
+                "waiting": self.waiting,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "adaptive": self.adaptive
+            }
+
+    def _admit(self):
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def _observe(self, latency):
+        self._window_total += latency
+        self._window_count += 1
+        if self._window_count < self.window:
+            return
+        mean = self._window_total / self._window_count
+        self._window_total, self._window_count = 0.0, 0
+        if mean > self.target_latency:
+            self.limit = max(self.min_limit, int(self.limit * 0.75))
+        elif self.limit < self.max_limit:
+            self.limit += 1
+            self._condition.notify_all()
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU cache with a per-entry TTL and optional byte budget.
+
+    `size_of` measures a value for the byte budget; it defaults to len(), which
+    suits bytes/str payloads.
+
+    Every invalidate() and clear() bumps a generation counter. A reader that
+    takes generation() before loading a value and passes it to set() never
+    stores a value that an invalidation raced past: the set is dropped when
+    anything was invalidated in between.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=60, size_of=len):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_of = size_of
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, ttl=None, generation=None, replace=None):
+        """Store `value`; with `generation`, only if nothing was invalidated since it was taken.
+
+        `replace(old, new)` decides whether a live entry already under `key`
+        is overwritten, e.g. to never trade a newer version for an older one.
+        Returns whether the value was stored.
+        """
+        size = self.size_of(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return False
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            current = self._data.get(key)
+            if (replace is not None and current is not None and current[2] > time.monotonic()
+                    and not replace(current[0], value)):
+                return False
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, size, expires_at)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (
+                    self.max_bytes is not None and self._bytes > self.max_bytes):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def invalidate(self, key):
+        with self._lock:
+            # Bumped even when the key is absent: a reader may be about to set it
+            self._generation += 1
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+    def _remove(self, key):
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
@@ -0,0 +1,36 @@
+import hashlib
+from flask import Response, request
+from werkzeug.http import is_resource_modified
+
+
+def make_etag(*parts):
+    """Build an ETag value from the given parts."""
+    raw = ':'.join(str(part) for part in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def has_conditional_headers():
+    return bool(request.if_none_match or request.if_modified_since)
+
+
+def is_not_modified(etag, last_modified=None):
+    """Return True when If-None-Match / If-Modified-Since say the client copy is current."""
+    return not is_resource_modified(request.environ, etag=etag, last_modified=last_modified)
+
+
+def not_modified_response(etag, last_modified=None):
+    response = Response(status=304)
+    return set_validators(response, etag, last_modified)
+
+
+def set_validators(response, etag, last_modified=None):
+    """Set the ETag and Last-Modified headers.
+
+    ETags are sent weak: a 200 may be gzip- or deflate-encoded on the way out
+    while a 304 never is, and both must carry the same ETag for caches to
+    match them. If-None-Match uses weak comparison, so nothing else changes.
+    """
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
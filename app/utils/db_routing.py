@@ -0,0 +1,49 @@
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+
+# Bind key prefix of the read replicas declared in READ_REPLICA_URIS
+REPLICA_BIND_PREFIX = 'replica_'
+
+
+def replica_binds(uris):
+    """Map READ_REPLICA_URIS to SQLALCHEMY_BINDS entries: replica_0, replica_1, ..."""
+    return {f"{REPLICA_BIND_PREFIX}{index}": uri for index, uri in enumerate(uris)}
+
+
+def reads_use_replica():
+    """Return True when plain SELECTs issued now in this app context would go to a read replica."""
+    return (has_app_context() and current_app.extensions.get('replica_cycle') is not None
+            and not g.get('wrote_primary') and not g.get('read_primary'))
+
+
+def reads_pinned_to_primary():
+    """Return True when replicas exist but this context reads from the primary.
+
+    That is the case after a write and for the whole request of a client in
+    its read-your-writes window. Process-local caches may predate a write the
+    client made through another worker, so such reads should skip them.
+    """
+    return (has_app_context() and current_app.extensions.get('replica_cycle') is not None
+            and bool(g.get('wrote_primary') or g.get('read_primary')))
+
+
+class RoutingSession(Session):
+    """Session that sends plain SELECTs to read replicas and everything else to the primary.
+
+    Routing is active once register_replica_routing() has run for the app.
+    Replicas are picked round-robin per statement. INSERT/UPDATE/DELETE,
+    SELECT ... FOR UPDATE, raw SQL and flushes always use the primary, and after the first write the
+    rest of the app context (the request) reads from the primary too, so
+    refreshing just-committed objects never hits a lagging replica. Reads are
+    also kept on the primary while g.read_primary is set, by the
+    read-your-writes window or for a request with a non-safe method.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            if getattr(clause, 'is_dml', False) or self._flushing:
+                g.wrote_primary = True
+            elif (getattr(clause, 'is_select', False) and getattr(clause, '_for_update_arg', None) is None
+                    and reads_use_replica()):
+                return self._db.engines[next(current_app.extensions['replica_cycle'])]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -11,4 +11,15 @@ def register_error_handlers(app):
 
     @app.errorhandler(404)
     def not_found(error):
-        return jsonify({"error": "Not Found", "message": error.description}), 404
\ No newline at end of file
+        return jsonify({"error": "Not Found", "message": error.description}), 404
+
+    @app.errorhandler(409)
+    def conflict(error):
+        return jsonify({"error": "Conflict", "message": error.description}), 409
+
+    @app.errorhandler(503)
+    def service_unavailable(error):
+        headers = {}
+        if getattr(error, 'retry_after', None) is not None:
+            headers['Retry-After'] = str(error.retry_after)
+        return jsonify({"error": "Service Unavailable", "message": error.description}), 503, headers
@@ -0,0 +1,19 @@
+import threading
+from flask import current_app
+
+# Reentrant, so a factory may itself look up another lazily created extension
+_lock = threading.RLock()
+
+
+def get_or_create_extension(key, create):
+    """Return current_app.extensions[key], building it with create() only once per app.
+
+    Creation happens under a lock, so concurrent first requests cannot each
+    build their own pool, queue or engine and leak all but one of them.
+    """
+    extensions = current_app.extensions
+    if key not in extensions:
+        with _lock:
+            if key not in extensions:
+                extensions[key] = create()
+    return extensions[key]
@@ -0,0 +1,108 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class QueueFullError(Exception):
+    """Raised when the group-commit queue already holds as many items as it may."""
+
+
+class GroupCommitQueue:
+    """Collect items from many callers and write them in batches on one background thread.
+
+    submit() returns a Future right away. The flusher thread takes the first
+    waiting item, keeps collecting until it has `max_rows` items or
+    `max_delay` seconds have passed since that first item, then calls
+    flush(items), which must return one result per item in order and write
+    all of them or none. Each future resolves with its item's result only
+    after flush() returns. When a batch of several items fails, each item is
+    flushed again on its own, so only the items that fail alone see the
+    error and one caller's bad item cannot fail everyone else's write.
+    """
+
+    _STOP = object()
+
+    def __init__(self, flush, max_rows=100, max_delay=0.005, max_queue=1000, name='group-commit'):
+        self._flush = flush
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise QueueFullError("Write queue is full") from None
+        return future
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "batches": self.batches,
+                "items": self.items,
+                "rejected": self.rejected,
+                "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0
+            }
+
+    def close(self):
+        """Flush what is already queued, then stop the flusher thread."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is self._STOP:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is self._STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._write(batch)
+
+    def _write(self, batch):
+        # Callers that cancelled while queued are left out of the write
+        pending = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+        try:
+            self._flush_batch(pending)
+        except BaseException as e:
+            if len(pending) == 1:
+                pending[0][1].set_exception(e)
+                return
+            for entry in pending:
+                try:
+                    self._flush_batch([entry])
+                except BaseException as item_error:
+                    entry[1].set_exception(item_error)
+
+    def _flush_batch(self, pending):
+        results = self._flush([item for item, _ in pending])
+        with self._lock:
+            self.batches += 1
+            self.items += len(pending)
+        for (_, future), result in zip(pending, results):
+            future.set_result(result)
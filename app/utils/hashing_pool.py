@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from flask import current_app
+from .extensions import get_or_create_extension
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the hashing pool already has as much work as it may hold."""
+
+
+class HashingPool:
+    """Bounded executor for CPU-heavy password hashing.
+
+    At most `workers` jobs run at once and at most `max_queue` more wait for a
+    worker; submitting beyond that raises PoolSaturatedError immediately
+    instead of queueing without limit. hashlib.pbkdf2_hmac releases the GIL,
+    so the thread kind already hashes in parallel; the process kind isolates
+    the work from the web workers completely.
+    """
+
+    def __init__(self, workers=4, max_queue=16, kind='thread'):
+        if kind not in ('thread', 'process'):
+            raise ValueError("kind must be 'thread' or 'process'")
+        executor_cls = ProcessPoolExecutor if kind == 'process' else ThreadPoolExecutor
+        self._executor = executor_cls(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self.capacity = workers + max_queue
+        self.in_flight = 0
+        self.rejected = 0
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PoolSaturatedError("Password hashing pool is saturated")
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def run(self, fn, *args):
+        """Run fn(*args) on the pool and wait for its result."""
+        return self.submit(fn, *args).result()
+
+    def stats(self):
+        with self._lock:
+            return {"capacity": self.capacity, "in_flight": self.in_flight, "rejected": self.rejected}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+
+def get_hashing_pool():
+    """Return the app's password hashing pool, creating it from config on first use."""
+    config = current_app.config
+    return get_or_create_extension('hashing_pool', lambda: HashingPool(
+        workers=config.get('PASSWORD_HASH_WORKERS', 4),
+        max_queue=config.get('PASSWORD_HASH_QUEUE_SIZE', 16),
+        kind=config.get('PASSWORD_HASH_POOL', 'thread')
+    ))
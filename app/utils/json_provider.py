@@ -0,0 +1,35 @@
+import json
+from flask.json.provider import DefaultJSONProvider
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider tuned for API responses.
+
+    Keys keep insertion order instead of being sorted, output is compact UTF-8,
+    and a single encoder instance is reused for every call without extra options.
+    """
+
+    sort_keys = False
+    ensure_ascii = False
+    compact = True
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._encoder = json.JSONEncoder(default=self.default, ensure_ascii=False, separators=(',', ':'))
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            kwargs.setdefault('separators', (',', ':'))
+            return super().dumps(obj, **kwargs)
+        return self._encoder.encode(obj)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(f"{self.dumps(obj)}\n", mimetype=self.mimetype)
+
+
+def join_fragments(dumps, fragments, **fields):
+    """Assemble {"data": [...], **fields} from already-serialised JSON fragments without re-encoding them."""
+    tail = dumps(fields)[1:] if fields else '}'
+    separator = ',' if fields else ''
+    return b'{"data":[' + b','.join(fragments) + b']' + (separator + tail).encode('utf-8')
@@ -1,6 +1,9 @@
+import hashlib
+import time
 import jwt
 from datetime import datetime, timedelta
 from flask import current_app
+from .cache import LRUCache
 
 def create_jwt_token(user_id, token_type):
     """Generate a JWT token (access or refresh) for the given user ID."""
@@ -46,4 +49,34 @@ def verify_jwt_token(token, token_type):
         return None
     except jwt.InvalidTokenError as e:
         print(f"Invalid token{str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+
+def get_token_cache():
+    """Return the app's cache of verified token payloads, creating it from config on first use."""
+    cache = current_app.extensions.get('token_cache')
+    if cache is None:
+        cache = LRUCache(max_entries=current_app.config.get('TOKEN_CACHE_MAX_ENTRIES', 10000))
+        current_app.extensions['token_cache'] = cache
+    return cache
+
+
+def verify_jwt_token_cached(token, token_type):
+    """Verify a JWT token like verify_jwt_token, remembering accepted tokens until they expire."""
+    cache = get_token_cache()
+    key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    payload = cache.get(key)
+    if payload is None:
+        payload = verify_jwt_token(token, token_type)
+        if not payload:
+            return None
+        ttl = payload.get('exp', 0) - time.time()
+        if ttl > 0:
+            cache.set(key, payload, ttl=ttl)
+    elif payload.get('type') != token_type:
+        return None
+    return dict(payload)
+
+
+def token_cache_stats():
+    return get_token_cache().stats()
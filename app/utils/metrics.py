@@ -0,0 +1,87 @@
+import threading
+from bisect import bisect_left
+
+# Upper bounds in seconds for request latency
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds in bytes for request and response bodies
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def format_labels(names, values):
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in values)
+    return ','.join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+class Histogram:
+    """Fixed-bucket histogram keyed by a tuple of label values.
+
+    Each observation is one bisect and three additions; buckets are only made
+    cumulative when the histogram is rendered.
+    """
+
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            base = format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+
+class RequestMetrics:
+    """Per-endpoint request latency, body sizes and in-flight requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.latency = Histogram('http_request_duration_seconds', 'Request latency in seconds.',
+                                 ('method', 'endpoint', 'status'), LATENCY_BUCKETS)
+        self.request_size = Histogram('http_request_size_bytes', 'Request body size in bytes.',
+                                      ('method', 'endpoint'), SIZE_BUCKETS)
+        self.response_size = Histogram('http_response_size_bytes',
+                                       'Response body size in bytes (streamed bodies excluded).',
+                                       ('method', 'endpoint'), SIZE_BUCKETS)
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def observe(self, method, endpoint, status, seconds, request_bytes, response_bytes):
+        with self._lock:
+            self.latency.observe((method, endpoint, str(status)), seconds)
+            self.request_size.observe((method, endpoint), request_bytes)
+            if response_bytes is not None:
+                self.response_size.observe((method, endpoint), response_bytes)
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = ["# HELP http_requests_in_flight Requests currently being handled.",
+                     "# TYPE http_requests_in_flight gauge",
+                     f"http_requests_in_flight {self.in_flight}"]
+            for histogram in (self.latency, self.request_size, self.response_size):
+                lines.extend(histogram.render())
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+
+
+def encode_cursor(date_created, pin_id, direction, order_dir, author=None):
+    """Encode a (date_created, id) keyset position into an opaque cursor string.
+
+    The cursor is bound to the listing it came from: `order_dir` and the
+    normalised `author` filter (None for all pins) are stored with it.
+    """
+    raw = json.dumps({"k": [date_created.isoformat(), pin_id], "d": direction, "o": order_dir, "a": author},
+                     separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, order_dir, author=None):
+    """Decode a cursor produced by encode_cursor for the same order_dir and author.
+
+    Returns a ((date_created, id), direction) tuple and raises ValueError for
+    anything that was not produced by encode_cursor, or that was issued for a
+    different ordering or author filter.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        date_iso, pin_id = data["k"]
+        direction = data["d"]
+        if direction not in ('next', 'prev') or not isinstance(pin_id, int):
+            raise ValueError("bad cursor")
+        if data["o"] != order_dir or data["a"] != author:
+            raise ValueError("cursor belongs to another listing")
+        return (datetime.fromisoformat(date_iso), pin_id), direction
+    except (TypeError, KeyError, UnicodeError, json.JSONDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def parse_limit(value, default=DEFAULT_PAGE_LIMIT, maximum=MAX_PAGE_LIMIT):
+    """Parse the `limit` query parameter, raising ValueError when out of range."""
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        limit = 0
+    if limit < 1 or limit > maximum:
+        raise ValueError(f"limit must be between 1 and {maximum}")
+    return limit
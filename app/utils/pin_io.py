@@ -0,0 +1,122 @@
+import csv
+import json
+import os
+from datetime import datetime
+
+FORMATS = ('csv', 'ndjson')
+IMPORT_FIELDS = ('title', 'body', 'image_link', 'author')
+
+
+class RecordError(ValueError):
+    """Raised for a record that cannot be imported, with its 1-based record number."""
+
+    def __init__(self, record_no, message):
+        super().__init__(f"record {record_no}: {message}")
+        self.record_no = record_no
+
+
+def detect_format(path, fmt=None):
+    """Return the explicit format, or guess it from the file extension."""
+    if fmt:
+        return fmt
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('jsonl', 'ndjson'):
+        return 'ndjson'
+    if extension == 'csv':
+        return 'csv'
+    raise ValueError(f"Cannot tell the format of {path}; pass --format")
+
+
+class LineReader:
+    """Iterate the decoded lines of a binary file while tracking the byte offset consumed so far.
+
+    csv.reader pulls exactly the lines a record needs, so after each record
+    `offset` is where the next record starts; that is what makes a resumed
+    import able to seek straight past what was already committed.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self.offset = f.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self._f.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode('utf-8')
+
+
+def parse_record(record, record_no):
+    """Turn one CSV row or NDJSON object into Pin.bulk_create input."""
+    if not isinstance(record, dict):
+        raise RecordError(record_no, "expected an object")
+    missing = [field for field in IMPORT_FIELDS if not record.get(field)]
+    if missing:
+        raise RecordError(record_no, f"missing {', '.join(missing)}")
+    for field in IMPORT_FIELDS:
+        if not isinstance(record[field], str):
+            raise RecordError(record_no, f"{field} must be a string")
+    pin_data = {field: record[field] for field in IMPORT_FIELDS}
+    try:
+        date_created = record.get("date_created")
+        pin_data["date_created"] = datetime.fromisoformat(date_created) if date_created else datetime.utcnow()
+    except (TypeError, ValueError):
+        raise RecordError(record_no, "date_created must be an ISO 8601 datetime") from None
+    return pin_data
+
+
+def read_pins(f, fmt, start_offset=0):
+    """Yield (pin_data, offset_after_record) from a binary file, starting at `start_offset`.
+
+    For CSV the header is always read from the top of the file first.
+    Record numbers in errors count from the start offset.
+    """
+    fieldnames = None
+    if fmt == 'csv':
+        f.seek(0)
+        fieldnames = next(csv.reader(LineReader(f)), None)
+        if fieldnames is None:
+            return
+        start_offset = max(start_offset, f.tell())
+    f.seek(start_offset)
+    lines = LineReader(f)
+
+    if fmt == 'csv':
+        for record_no, row in enumerate(csv.DictReader(lines, fieldnames=fieldnames), start=1):
+            yield parse_record(row, record_no), lines.offset
+        return
+
+    record_no = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        record_no += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise RecordError(record_no, "invalid JSON") from None
+        yield parse_record(record, record_no), lines.offset
+
+
+class PinWriter:
+    """Write pins as CSV or NDJSON to a text stream."""
+
+    def __init__(self, f, fmt, fields, dumps):
+        self._f = f
+        self._fields = fields
+        self._dumps = dumps
+        self._csv = None
+        if fmt == 'csv':
+            self._csv = csv.writer(f, lineterminator='\n')
+            self._csv.writerow(fields)
+
+    def write(self, pin):
+        data = pin.to_dict(self._fields)
+        if self._csv is not None:
+            self._csv.writerow(data.values())
+        else:
+            self._f.write(self._dumps(data) + '\n')
@@ -0,0 +1,142 @@
+"""Compare concurrent pin-read throughput of the pin routes with and without ASYNC_DATABASE_URI.
+
+Usage:
+    python -m benchmarks.async_repository --pins 5000 --concurrency 20 --requests 50 --latency-ms 2
+
+Each client thread sends --requests pairs of GET /api/v1/pins?limit=20 and
+GET /api/v1/pins/<id> through the full WSGI stack, the way a threaded WSGI
+server would, first with the sync model and then with the async repository.
+--latency-ms adds a per-statement delay inside the DBAPI call to stand in for
+the network round trip to MySQL. The pin cache is disabled so every request
+reaches the database. Results are printed as JSON.
+
+Under WSGI, Flask runs every async view to completion on its own event loop
+while the worker thread waits, so the asyncio driver cannot overlap requests
+any better than the threads already do; expect no gain here. The repository
+only pays off when the views share one long-running loop.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import event
+from app.models.pin import Pin, db
+from app.models.pin_repository import get_pin_repository
+from app.routes.pins import pins_bp
+
+
+def add_latency(engine, latency):
+    """Sleep inside sqlite3 on every statement, in whichever thread runs the DBAPI call."""
+    @event.listens_for(engine, "connect")
+    def install_trace(dbapi_connection, connection_record):
+        raw = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+        raw = getattr(raw, "_conn", raw)  # aiosqlite wraps the sqlite3 connection
+        raw.set_trace_callback(lambda statement: time.sleep(latency))
+
+
+def make_app(path, concurrency, async_url=None):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"pool_size": concurrency, "max_overflow": 0,
+                                               "connect_args": {"check_same_thread": False}}
+    app.config["ASYNC_DATABASE_URI"] = async_url
+    app.config["PIN_CACHE_TTL_SECONDS"] = 0
+    db.init_app(app)
+    app.register_blueprint(pins_bp, url_prefix='/api/v1')
+    return app
+
+
+def seed(app, pins):
+    with app.app_context():
+        db.create_all()
+        start = datetime(2025, 1, 1)
+        authors = [f"author{i}" for i in range(100)]
+        db.session.add_all(Pin(
+            title=f"Pin {i}",
+            body="x" * 200,
+            image_link=f"https://example.com/{i}.jpg",
+            author=authors[i % len(authors)],
+            date_created=start + timedelta(seconds=i)
+        ) for i in range(pins))
+        db.session.commit()
+
+
+def run_clients(app, pins, concurrency, requests):
+    rng = random.Random(42)
+    ids = [rng.randint(1, pins) for _ in range(concurrency * requests)]
+    barrier = threading.Barrier(concurrency + 1)
+    failures = []
+
+    def client(offset):
+        http = app.test_client()
+        barrier.wait()
+        for i in range(requests):
+            for url in ('/api/v1/pins?limit=20', f'/api/v1/pins/{ids[offset * requests + i]}'):
+                if http.get(url).status_code != 200:
+                    failures.append(url)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if failures:
+        raise RuntimeError(f"{len(failures)} requests failed, e.g. {failures[0]}")
+    return elapsed
+
+
+def report(mode, elapsed, total):
+    return {"mode": mode, "requests": total, "seconds": round(elapsed, 4),
+            "throughput_rps": round(total / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pins", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        sync_app = make_app(path, args.concurrency)
+        seed(sync_app, args.pins)
+        total = args.concurrency * args.requests * 2
+        latency = args.latency_ms / 1000
+
+        with sync_app.app_context():
+            add_latency(db.engine, latency)
+            db.engine.dispose()  # reconnect so seeding connections pick up the latency hook
+        sync_elapsed = run_clients(sync_app, args.pins, args.concurrency, args.requests)
+
+        async_app = make_app(path, args.concurrency, async_url=f"sqlite+aiosqlite:///{path}")
+        with async_app.app_context():
+            add_latency(db.engine, latency)
+            repository = get_pin_repository()
+            add_latency(repository.engine.sync_engine, latency)
+        try:
+            async_elapsed = run_clients(async_app, args.pins, args.concurrency, args.requests)
+        finally:
+            with async_app.app_context():
+                asyncio.run(repository.dispose())
+
+    results = [report("sync_model", sync_elapsed, total), report("async_repository", async_elapsed, total)]
+    print(json.dumps({
+        "params": vars(args),
+        "results": results,
+        "speedup": round(sync_elapsed / async_elapsed, 2)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare two benchmark suite reports scenario by scenario.
+
+Usage:
+    python -m benchmarks.compare before.json after.json [--threshold 10]
+
+Prints, as JSON, the relative change in throughput and p50/p95/p99 latency for
+every scenario present in both reports. Scenarios whose p95 latency grew by
+more than --threshold percent are listed under "regressions" and make the
+command exit with status 1, so it can gate a CI job.
+"""
+import argparse
+import json
+import sys
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def change(before, after):
+    if not before:
+        return None
+    return round((after - before) / before * 100, 1)
+
+
+def compare(before, after, threshold):
+    baseline = {row["scenario"]: row for row in before["results"]}
+    scenarios, regressions = {}, []
+    for row in after["results"]:
+        old = baseline.get(row["scenario"])
+        if old is None:
+            continue
+        deltas = {f"{metric}_change_pct": change(old[metric], row[metric]) for metric in METRICS}
+        deltas.update({metric: [old[metric], row[metric]] for metric in METRICS})
+        scenarios[row["scenario"]] = deltas
+        p95 = deltas["p95_ms_change_pct"]
+        if p95 is not None and p95 > threshold:
+            regressions.append(row["scenario"])
+    return {
+        "before": {"commit": before.get("commit"), "dataset": before.get("dataset")},
+        "after": {"commit": after.get("commit"), "dataset": after.get("dataset")},
+        "threshold_pct": threshold,
+        "scenarios": scenarios,
+        "regressions": regressions
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed p95 growth in percent")
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    report = compare(before, after, args.threshold)
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report["regressions"] else 0)
+
+
+if __name__ == "__main__":
+    main()
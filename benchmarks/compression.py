@@ -0,0 +1,82 @@
+"""Measure bytes on the wire and CPU cost of response compression for pin list pages.
+
+Usage:
+    python -m benchmarks.compression --pins 2000 --requests 50 --page-sizes 20,100
+
+For each page size, GET /api/v1/pins is issued through the Flask test client
+with no Accept-Encoding, with gzip and with deflate. The report gives the
+average response size and the average CPU time per request, so the
+compression overhead can be read as the difference from the identity row.
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from flask import Flask
+from app.middleware.compression import register_compression
+from app.models.pin import Pin, db
+from app.routes.pins import pins_bp
+from app.utils.json_provider import FastJSONProvider
+
+
+def build_app(pins, level):
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["COMPRESSION_LEVEL"] = level
+    app.config["PIN_CACHE_MAX_ENTRIES"] = pins
+    db.init_app(app)
+    app.register_blueprint(pins_bp, url_prefix='/api/v1')
+    register_compression(app)
+
+    with app.app_context():
+        db.create_all()
+        start = datetime(2025, 1, 1)
+        db.session.add_all(Pin(
+            title=f"Pin number {i}",
+            body="A short description of the pin that repeats a lot of words. " * 3,
+            image_link=f"https://images.example.com/pins/{i}.jpg",
+            author=f"author{i % 50}",
+            date_created=start + timedelta(seconds=i)
+        ) for i in range(pins))
+        db.session.commit()
+    return app
+
+
+def measure(client, url, encoding, requests):
+    headers = {"Accept-Encoding": encoding} if encoding else {}
+    client.get(url, headers=headers)  # warm caches
+    total_bytes = 0
+    cpu_started = time.process_time()
+    for _ in range(requests):
+        total_bytes += len(client.get(url, headers=headers).get_data())
+    cpu = time.process_time() - cpu_started
+    return {"encoding": encoding or "identity", "bytes": total_bytes // requests,
+            "cpu_ms_per_request": round(cpu * 1000 / requests, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pins", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--page-sizes", default="20,100")
+    parser.add_argument("--level", type=int, default=6)
+    args = parser.parse_args()
+
+    app = build_app(args.pins, args.level)
+    results = []
+    with app.app_context():
+        client = app.test_client()
+        for page_size in (int(size) for size in args.page_sizes.split(',')):
+            url = f'/api/v1/pins?limit={page_size}'
+            rows = [measure(client, url, encoding, args.requests) for encoding in (None, "gzip", "deflate")]
+            identity = rows[0]["bytes"]
+            for row in rows:
+                row["ratio"] = round(row["bytes"] / identity, 3)
+            results.append({"page_size": page_size, "results": rows})
+
+    print(json.dumps({"params": vars(args), "pages": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
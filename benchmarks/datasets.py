@@ -0,0 +1,78 @@
+"""Deterministic pin datasets for the benchmark suite.
+
+A dataset is a SQLite file identified by its size, author count and seed, so
+two runs (or two commits) with the same parameters benchmark identical data.
+Seeded files are cached under benchmarks/.data and reused.
+"""
+import os
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func, insert, select
+from app.models.author_stats import AuthorStats, pins
+from app.models.pin import Pin, db, normalize_author
+from app.models.user import User
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '.data')
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+BENCH_USERNAME = 'bench'
+BENCH_PASSWORD = 'bench-password'
+WORDS = ('sunset beach mountain river forest city street portrait garden coffee '
+         'travel design recipe vintage minimal winter summer ocean desert night').split()
+
+
+def dataset_path(size, authors, seed):
+    return os.path.join(DATA_DIR, f'pins-{size}-{authors}a-s{seed}.db')
+
+
+def generate_rows(size, authors, seed, start=datetime(2024, 1, 1)):
+    """Yield pin rows in id order; the same arguments always give the same rows."""
+    rng = random.Random(seed)
+    moment = start
+    for i in range(size):
+        moment += timedelta(seconds=rng.randint(0, 120))
+        author = f"author{rng.randrange(authors):05d}"
+        words = rng.sample(WORDS, 6)
+        yield {
+            "title": ' '.join(words[:3]).title(),
+            "body": ' '.join(words) + f" #{i}",
+            "image_link": f"https://images.example.com/{seed}/{i}.jpg",
+            "author": author,
+            "author_norm": normalize_author(author),
+            "date_created": moment,
+            "updated_at": moment,
+            "version": 1
+        }
+
+
+def ensure_dataset(size, authors=1000, seed=1234, chunk_size=10_000):
+    """Create the dataset file if it is missing and return its path."""
+    path = dataset_path(size, authors, seed)
+    if os.path.exists(path):
+        return path
+    os.makedirs(DATA_DIR, exist_ok=True)
+    partial = path + '.partial'
+    if os.path.exists(partial):
+        os.remove(partial)
+
+    engine = create_engine(f"sqlite:///{partial}")
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "username": BENCH_USERNAME,
+            "password_hash": User.generate_password_hash(BENCH_PASSWORD)
+        }])
+        chunk = []
+        for row in generate_rows(size, authors, seed):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                conn.execute(insert(Pin), chunk)
+                chunk = []
+        if chunk:
+            conn.execute(insert(Pin), chunk)
+        conn.execute(insert(AuthorStats.__table__).from_select(
+            ['author_norm', 'author', 'pin_count', 'first_created', 'last_created'],
+            select(pins.c.author_norm, func.max(pins.c.author), func.count(), func.min(pins.c.date_created),
+                   func.max(pins.c.date_created)).group_by(pins.c.author_norm)))
+    engine.dispose()
+    os.replace(partial, path)
+    return path
@@ -0,0 +1,79 @@
+"""Micro-benchmark of pin list serialisation cost per 10k pins.
+
+Usage:
+    python -m benchmarks.serialization --pins 10000 --repeat 5
+
+Compares three ways of rendering {"data": [...]} for the same pins:
+  default_jsonify    Flask's DefaultJSONProvider over Pin.to_dict() (the old path)
+  fast_provider      FastJSONProvider over Pin.to_dict()
+  cached_fragments   FastJSONProvider with warm per-pin fragments joined by join_fragments
+Reports the best-of-N milliseconds, scaled to 10k pins, as JSON.
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.models.pin import Pin, db
+from app.utils.json_provider import FastJSONProvider, join_fragments
+
+
+def make_pins(count):
+    start = datetime(2025, 1, 1)
+    pins = []
+    for i in range(count):
+        pin = Pin(
+            title=f"Pin {i}",
+            body="Lorem ipsum dolor sit amet " * 8,
+            image_link=f"https://example.com/images/{i}.jpg",
+            author=f"author{i % 100}",
+            date_created=start + timedelta(seconds=i)
+        )
+        pin.id = i + 1
+        pin.updated_at = pin.date_created
+        pin.version = 1
+        pins.append(pin)
+    return pins
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pins", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["PIN_CACHE_MAX_ENTRIES"] = args.pins  # the whole working set stays cached
+    db.init_app(app)
+    pins = make_pins(args.pins)
+    scale = 10000 / args.pins
+
+    with app.app_context():
+        app.json = DefaultJSONProvider(app)
+        default = best_of(args.repeat, lambda: app.json.dumps({"data": [pin.to_dict() for pin in pins]}))
+
+        app.json = FastJSONProvider(app)
+        fast = best_of(args.repeat, lambda: app.json.dumps({"data": [pin.to_dict() for pin in pins]}))
+
+        Pin.payloads_for(pins)  # warm the fragment cache
+        cached = best_of(args.repeat, lambda: join_fragments(app.json.dumps, Pin.payloads_for(pins),
+                                                             count=len(pins)))
+
+    results = {name: round(seconds * 1000 * scale, 2) for name, seconds in
+               (("default_jsonify", default), ("fast_provider", fast), ("cached_fragments", cached))}
+    print(json.dumps({"params": vars(args), "ms_per_10k_pins": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
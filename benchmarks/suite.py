@@ -0,0 +1,199 @@
+"""Reproducible end-to-end benchmark of the pins and users API.
+
+Usage:
+    python -m benchmarks.suite --dataset 10k --requests 500 --output before.json
+    python -m benchmarks.suite --dataset 100k --scenarios list_pins,get_pin
+    python -m benchmarks.compare before.json after.json
+
+The dataset is seeded deterministically (see benchmarks.datasets) and copied
+to a scratch file for every run, so writes made by one run never leak into the
+next. Each scenario issues requests through the Flask test client of the app
+from create_app() and reports throughput and p50/p95/p99 latency. Request
+parameters (authors, pin ids, search words) are drawn from a seeded random,
+so two commits benchmarked with the same arguments replay the same requests.
+
+Scenarios:
+  list_pins         GET /api/v1/pins, first page
+  list_pins_author  GET /api/v1/pins?author=..., first page for a random author
+  list_pins_deep    GET /api/v1/pins following the next cursor page after page
+  get_pin           GET /api/v1/pins/<id> for random ids
+  search            GET /api/v1/pins/search?q=... for random words
+  pin_get_all       Pin.get_all(author) called directly, without HTTP
+  create_pin        POST /api/v1/pins with a bearer token (authenticate + insert)
+  authenticate      PUT /api/v1/pins/<missing id>: token check plus one lookup
+  token             POST /api/v1/token (PBKDF2 password check)
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from benchmarks.datasets import BENCH_PASSWORD, BENCH_USERNAME, SIZES, WORDS, ensure_dataset
+
+# The token scenario hashes 100k PBKDF2 rounds per request, so it runs fewer
+TOKEN_REQUESTS_DIVISOR = 10
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(name, latencies, elapsed, errors):
+    ordered = sorted(latencies)
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3)
+    }
+
+
+def run_scenario(name, count, call, warmup):
+    """Time `count` calls of call(i); call returns True when the request succeeded."""
+    for i in range(warmup):
+        call(i)
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for i in range(count):
+        t0 = time.perf_counter()
+        ok = call(i)
+        latencies.append(time.perf_counter() - t0)
+        errors += not ok
+    return summarize(name, latencies, time.perf_counter() - started, errors)
+
+
+def build_scenarios(app, client, size, authors, seed):
+    from app.models.pin import Pin
+    from app.utils.jwt_utils import create_jwt_token
+
+    rng = random.Random(seed)
+    loop = asyncio.new_event_loop()
+    pick_author = lambda: f"author{rng.randrange(authors):05d}"
+    with app.app_context():
+        bearer = {"Authorization": f"Bearer {create_jwt_token(1, token_type='access')}"}
+    deep = {"cursor": None}
+
+    def get(url, **kwargs):
+        return client.get(url, **kwargs).status_code == 200
+
+    def list_pins_deep(_):
+        url = '/api/v1/pins?limit=20' + (f"&cursor={deep['cursor']}" if deep['cursor'] else '')
+        response = client.get(url)
+        deep['cursor'] = response.get_json()["next"]
+        return response.status_code == 200
+
+    def pin_get_all(_):
+        with app.app_context():
+            loop.run_until_complete(Pin.get_all(pick_author()))
+        return True
+
+    def create_pin(i):
+        response = client.post('/api/v1/pins', headers=bearer, json={
+            "title": f"Benchmark pin {i}",
+            "body": ' '.join(rng.sample(WORDS, 6)),
+            "image_link": f"https://images.example.com/bench/{i}.jpg",
+            "author": pick_author()
+        })
+        return response.status_code == 201
+
+    def authenticate(_):
+        response = client.put(f'/api/v1/pins/{size * 10}', headers=bearer, json={
+            "title": "t", "body": "b", "image_link": "https://images.example.com/x.jpg", "author": "a"
+        })
+        return response.status_code == 404
+
+    def token(_):
+        response = client.post('/api/v1/token', json={"username": BENCH_USERNAME, "password": BENCH_PASSWORD})
+        return response.status_code == 200
+
+    return {
+        "list_pins": lambda _: get('/api/v1/pins?limit=20'),
+        "list_pins_author": lambda _: get(f'/api/v1/pins?limit=20&author={pick_author()}'),
+        "list_pins_deep": list_pins_deep,
+        "get_pin": lambda _: get(f'/api/v1/pins/{rng.randint(1, size)}'),
+        "search": lambda _: get(f'/api/v1/pins/search?q={rng.choice(WORDS)}'),
+        "pin_get_all": pin_get_all,
+        "create_pin": create_pin,
+        "authenticate": authenticate,
+        "token": token
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", choices=sorted(SIZES), default="10k")
+    parser.add_argument("--authors", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--scenarios", help="comma-separated subset, default all")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    size = SIZES[args.dataset]
+    source = ensure_dataset(size, args.authors, args.seed)
+    scratch = tempfile.mkdtemp(prefix='pins-bench-')
+    db_path = os.path.join(scratch, 'pins.db')
+    shutil.copyfile(source, db_path)
+
+    # Config reads the environment when create_app first imports it
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("FLASK_ENV", "production")
+    from app import create_app
+    app = create_app()
+    client = app.test_client()
+
+    scenarios = build_scenarios(app, client, size, args.authors, args.seed)
+    selected = args.scenarios.split(',') if args.scenarios else list(scenarios)
+    unknown = set(selected) - set(scenarios)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = []
+    try:
+        for name in selected:
+            count = args.requests // TOKEN_REQUESTS_DIVISOR if name == 'token' else args.requests
+            warmup = min(args.warmup, count)
+            results.append(run_scenario(name, max(count, 1), scenarios[name], warmup))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        "python": platform.python_version(),
+        "params": vars(args),
+        "dataset": {"pins": size, "authors": args.authors, "seed": args.seed},
+        "results": results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""add pins author_norm column and listing indexes
+
+Revision ID: 3f2a9c7d1e45
+Revises: c651a85ecd26
+Create Date: 2026-10-16 09:12:41.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c7d1e45'
+down_revision = 'c651a85ecd26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('pins', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('author_norm', sa.String(length=100), nullable=True))
+
+    # Backfill existing rows; must match app.models.pin.normalize_author
+    op.execute("UPDATE pins SET author_norm = LOWER(author)")
+
+    with op.batch_alter_table('pins', schema=None) as batch_op:
+        batch_op.alter_column('author_norm', existing_type=sa.String(length=100), nullable=False)
+        batch_op.create_index('ix_pins_author_norm_date_created_id', ['author_norm', 'date_created', 'id'], unique=False)
+        batch_op.create_index('ix_pins_date_created', ['date_created'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('pins', schema=None) as batch_op:
+        batch_op.drop_index('ix_pins_date_created')
+        batch_op.drop_index('ix_pins_author_norm_date_created_id')
+        batch_op.drop_column('author_norm')
@@ -0,0 +1,36 @@
+"""add pins updated_at and version columns
+
+Revision ID: 7b4e0d2c9a18
+Revises: 3f2a9c7d1e45
+Create Date: 2026-10-16 10:03:27.518902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b4e0d2c9a18'
+down_revision = '3f2a9c7d1e45'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('pins', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+    # Existing rows have never been updated since they were created
+    op.execute("UPDATE pins SET updated_at = date_created")
+
+    with op.batch_alter_table('pins', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index('ix_pins_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('pins', schema=None) as batch_op:
+        batch_op.drop_index('ix_pins_updated_at')
+        batch_op.drop_column('version')
+        batch_op.drop_column('updated_at')
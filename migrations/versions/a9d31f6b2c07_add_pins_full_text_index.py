@@ -0,0 +1,50 @@
+"""add pins full-text index
+
+Revision ID: a9d31f6b2c07
+Revises: 7b4e0d2c9a18
+Create Date: 2026-10-16 11:41:08.336174
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d31f6b2c07'
+down_revision = '7b4e0d2c9a18'
+branch_labels = None
+depends_on = None
+
+# SQLite keeps an external-content FTS5 table in sync through triggers
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS pins_fts USING fts5(title, body, content='pins', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS pins_fts_ai AFTER INSERT ON pins BEGIN "
+    "INSERT INTO pins_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS pins_fts_ad AFTER DELETE ON pins BEGIN "
+    "INSERT INTO pins_fts(pins_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS pins_fts_au AFTER UPDATE OF title, body ON pins BEGIN "
+    "INSERT INTO pins_fts(pins_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO pins_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.create_index('ix_pins_title_body_fulltext', 'pins', ['title', 'body'], unique=False,
+                        mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+        # Index the rows that existed before the triggers
+        op.execute("INSERT INTO pins_fts(pins_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.drop_index('ix_pins_title_body_fulltext', table_name='pins')
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS pins_fts")
+        for trigger in ('pins_fts_ai', 'pins_fts_ad', 'pins_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
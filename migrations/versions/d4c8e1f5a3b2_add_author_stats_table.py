@@ -0,0 +1,37 @@
+"""add author_stats summary table
+
+Revision ID: d4c8e1f5a3b2
+Revises: a9d31f6b2c07
+Create Date: 2026-10-16 14:12:45.207731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4c8e1f5a3b2'
+down_revision = 'a9d31f6b2c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('author_stats',
+    sa.Column('author_norm', sa.String(length=100), nullable=False),
+    sa.Column('author', sa.String(length=100), nullable=False),
+    sa.Column('pin_count', sa.Integer(), nullable=False),
+    sa.Column('first_created', sa.DateTime(), nullable=False),
+    sa.Column('last_created', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('author_norm')
+    )
+    # Seed the summary from the pins already stored
+    op.execute(
+        "INSERT INTO author_stats (author_norm, author, pin_count, first_created, last_created) "
+        "SELECT author_norm, MAX(author), COUNT(*), MIN(date_created), MAX(date_created) "
+        "FROM pins GROUP BY author_norm"
+    )
+
+
+def downgrade():
+    op.drop_table('author_stats')
@@ -0,0 +1,30 @@
+"""add pin_imports progress table
+
+Revision ID: e7a2c4b9d610
+Revises: d4c8e1f5a3b2
+Create Date: 2026-10-17 09:41:12.583104
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a2c4b9d610'
+down_revision = 'd4c8e1f5a3b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('pin_imports',
+    sa.Column('source', sa.String(length=512), nullable=False),
+    sa.Column('byte_offset', sa.BigInteger(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('source')
+    )
+
+
+def downgrade():
+    op.drop_table('pin_imports')
@@ -0,0 +1,135 @@
+import threading
+import time
+import pytest
+from flask import Blueprint, Flask, Response, jsonify
+from app.middleware.admission import register_admission_control, route_group
+from app.utils.admission import ConcurrencyLimiter
+
+# Test requests under the limit are admitted and extra ones rejected when the queue is full
+def test_limit_and_full_queue():
+    limiter = ConcurrencyLimiter(limit=2, max_queue=0)
+    assert limiter.acquire() and limiter.acquire()
+    assert not limiter.acquire()
+    limiter.release(0.01)
+    assert limiter.acquire()
+    assert limiter.stats()["rejected"] == 1
+
+# Test a queued request is admitted when a slot frees up in time
+def test_queued_request_admitted():
+    limiter = ConcurrencyLimiter(limit=1, max_queue=1, queue_timeout=2)
+    assert limiter.acquire()
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(limiter.acquire()))
+    waiter.start()
+    deadline = time.monotonic() + 2
+    while limiter.stats()["waiting"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert limiter.stats()["waiting"] == 1
+    limiter.release(0.01)
+    waiter.join()
+    assert result == [True]
+
+# Test a queued request gives up after the queue timeout
+def test_queue_timeout():
+    limiter = ConcurrencyLimiter(limit=1, max_queue=1, queue_timeout=0.01)
+    assert limiter.acquire()
+    assert not limiter.acquire()
+    assert limiter.stats()["waiting"] == 0
+
+# Test the adaptive limit shrinks under slow windows and recovers under fast ones
+def test_adaptive_limit():
+    limiter = ConcurrencyLimiter(limit=8, adaptive=True, target_latency=0.1, min_limit=2, window=2)
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(0.5)
+    assert limiter.limit == 4
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(0.5)
+    assert limiter.limit == 2
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(0.01)
+    assert limiter.limit == 4
+    for _ in range(40):
+        limiter.acquire()
+        limiter.release(0.01)
+    assert limiter.limit == 8
+
+# Test requests are grouped by blueprint and method
+def test_route_group():
+    assert route_group('pins', 'GET') == 'reads'
+    assert route_group('pins', 'POST') == 'writes'
+    assert route_group('pins', 'DELETE') == 'writes'
+    assert route_group('users', 'POST') == 'auth'
+    assert route_group('internal', 'GET') is None
+
+# Fixture for an app whose write route blocks until released
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(ADMISSION_WRITE_LIMIT=1, ADMISSION_QUEUE_SIZE=0, ADMISSION_RETRY_AFTER=2)
+    pins = Blueprint('pins', __name__)
+    internal = Blueprint('internal', __name__)
+    app.started, app.release = threading.Event(), threading.Event()
+
+    @pins.route('/pins', methods=['POST'])
+    def create():
+        app.started.set()
+        app.release.wait(5)
+        return jsonify({"ok": True}), 201
+
+    @pins.route('/pins', methods=['GET'])
+    def read():
+        return jsonify({"ok": True})
+
+    @pins.route('/pins/stream')
+    def stream():
+        return Response((f'{{"id":{i}}}\n' for i in range(3)), mimetype='application/x-ndjson')
+
+    @internal.route('/pool')
+    def pool():
+        return jsonify({"ok": True})
+
+    app.register_blueprint(pins)
+    app.register_blueprint(internal, url_prefix='/internal')
+    register_admission_control(app)
+    return app
+
+# Test an over-limit write is shed with 503 and Retry-After while reads still pass
+def test_sheds_over_limit(app):
+    results = []
+    worker = threading.Thread(target=lambda: results.append(app.test_client().post('/pins').status_code))
+    worker.start()
+    app.started.wait(5)
+
+    client = app.test_client()
+    response = client.post('/pins')
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+    assert response.get_json()["error"] == "Service Unavailable"
+    assert client.get('/pins').status_code == 200
+    assert client.get('/internal/pool').status_code == 200
+
+    app.release.set()
+    worker.join()
+    assert results == [201]
+    limiters = app.extensions['admission']
+    assert limiters['writes'].stats()["active"] == 0
+    assert client.post('/pins').status_code == 201
+
+# Test a streamed response holds its read slot until the response is closed
+def test_stream_holds_slot_until_closed(app):
+    reads = app.extensions['admission']['reads']
+    response = app.test_client().get('/pins/stream')
+    assert reads.stats()["active"] == 1
+    assert len(response.get_data(as_text=True).splitlines()) == 3
+    response.close()
+    assert reads.stats()["active"] == 0
+
+# Test nothing is limited when admission control is disabled
+def test_disabled():
+    app = Flask(__name__)
+    app.config["ADMISSION_ENABLED"] = False
+    register_admission_control(app)
+    assert 'admission' not in app.extensions
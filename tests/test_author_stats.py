@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+from datetime import datetime
+from flask import Flask
+from app.commands import register_commands
+from app.models.author_stats import AuthorStats
+from app.models.pin import Pin, db
+from app.routes.authors import authors_bp
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    app.register_blueprint(authors_bp, url_prefix='/api')
+    register_commands(app)
+    return app
+
+@pytest.fixture
+def setup_db(app):
+    with app.app_context():
+        db.create_all()
+        yield
+        db.session.remove()
+        db.drop_all()
+
+def pin_data(author, day):
+    return {"title": "t", "body": "b", "image_link": "http://example.com/i.jpg", "author": author,
+            "date_created": datetime(2025, 1, day)}
+
+def summary():
+    db.session.expire_all()
+    return {row.author_norm: (row.pin_count, row.first_created.day, row.last_created.day)
+            for row in db.session.scalars(db.select(AuthorStats))}
+
+# Test create and bulk_create add to the summary
+@pytest.mark.asyncio
+async def test_create_updates_summary(setup_db):
+    await Pin.create(pin_data("Alice", 5))
+    await Pin.bulk_create([pin_data("alice", 2), pin_data("Bob", 3), pin_data("ALICE", 9)])
+    assert summary() == {"alice": (3, 2, 9), "bob": (1, 3, 3)}
+    assert db.session.get(AuthorStats, "alice").author == "ALICE"
+
+# Test deleting a pin recomputes first/last dates and drops empty authors
+@pytest.mark.asyncio
+async def test_delete_updates_summary(setup_db):
+    first = await Pin.create(pin_data("Alice", 1))
+    await Pin.create(pin_data("Alice", 4))
+    bob = await Pin.create(pin_data("Bob", 2))
+    first_id, bob_id = first.id, bob.id
+    await Pin.delete(first_id)
+    await Pin.delete(bob_id)
+    assert summary() == {"alice": (1, 4, 4)}
+
+# Test changing a pin's author through update and patch moves it between authors
+@pytest.mark.asyncio
+async def test_author_change_moves_pin(setup_db):
+    pin = await Pin.create(pin_data("Alice", 1))
+    await Pin.create(pin_data("Alice", 3))
+    pin_id = pin.id
+    await Pin.update(pin_id, {"title": "t", "body": "b", "image_link": "http://example.com/i.jpg", "author": "Bob"})
+    assert summary() == {"alice": (1, 3, 3), "bob": (1, 1, 1)}
+
+    await Pin.patch(pin_id, {"author": "Carol"}, 2)
+    assert summary() == {"alice": (1, 3, 3), "carol": (1, 1, 1)}
+
+    # A case-only change keeps the pin under the same author
+    await Pin.patch(pin_id, {"author": "CAROL"}, 3)
+    assert summary() == {"alice": (1, 3, 3), "carol": (1, 1, 1)}
+
+# Test set-based batch updates and deletes keep the summary in step
+@pytest.mark.asyncio
+async def test_batch_operations_update_summary(setup_db):
+    await Pin.bulk_create([pin_data("Alice", 1), pin_data("Alice", 2), pin_data("Bob", 3), pin_data("Carol", 4)])
+    await Pin.bulk_update({"author": "Dave"}, author="alice")
+    assert summary() == {"bob": (1, 3, 3), "carol": (1, 4, 4), "dave": (2, 1, 2)}
+
+    await Pin.bulk_delete(created_after=datetime(2025, 1, 2))
+    assert summary() == {"dave": (1, 1, 1)}
+
+# Test rebuild repairs drift from the pins table
+@pytest.mark.asyncio
+async def test_rebuild(setup_db):
+    await Pin.bulk_create([pin_data("Alice", 1), pin_data("Bob", 2)])
+    db.session.execute(db.update(AuthorStats).values(pin_count=99))
+    db.session.add(AuthorStats(author_norm="ghost", author="ghost", pin_count=1,
+                               first_created=datetime(2025, 1, 1), last_created=datetime(2025, 1, 1)))
+    db.session.commit()
+    assert AuthorStats.rebuild() == 2
+    assert summary() == {"alice": (1, 1, 1), "bob": (1, 2, 2)}
+
+# Test the flask authors rebuild command
+def test_rebuild_command(app, setup_db):
+    result = app.test_cli_runner().invoke(args=["authors", "rebuild"])
+    assert result.exit_code == 0
+    assert "0 authors" in result.output
+
+# Test GET /authors pages through authors in name order
+def test_get_authors(app, setup_db):
+    asyncio.run(Pin.bulk_create([pin_data(name, 1) for name in ("Carol", "alice", "Bob", "Alice")]))
+    client = app.test_client()
+    response = client.get('/api/authors?limit=2')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [row["author"] for row in body["data"]] == ["Alice", "Bob"]
+    assert body["data"][0]["pin_count"] == 2
+    assert body["next"] == "bob"
+
+    body = client.get(f'/api/authors?limit=2&after={body["next"]}').get_json()
+    assert [row["author"] for row in body["data"]] == ["Carol"]
+    assert body["next"] is None
+    assert client.get('/api/authors?limit=0').status_code == 400
+
+# Test GET /authors/<name>/stats is case-insensitive and 404s for unknown authors
+def test_get_author_stats(app, setup_db):
+    asyncio.run(Pin.bulk_create([pin_data("Alice", 3), pin_data("Alice", 7)]))
+    client = app.test_client()
+    response = client.get('/api/authors/ALICE/stats')
+    assert response.status_code == 200
+    assert response.get_json()["data"] == {"author": "Alice", "pin_count": 2,
+                                           "first_created": "2025-01-03T00:00:00",
+                                           "last_created": "2025-01-07T00:00:00"}
+    assert client.get('/api/authors/nobody/stats').status_code == 404
@@ -0,0 +1,79 @@
+from unittest.mock import patch
+from app.utils.cache import LRUCache
+
+# Test hits and misses are counted
+def test_get_set_counts():
+    cache = LRUCache(max_entries=2)
+    assert cache.get("a") is None
+    cache.set("a", b"1")
+    assert cache.get("a") == b"1"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+# Test least recently used entries are evicted first
+def test_lru_eviction():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.stats()["evictions"] == 1
+
+# Test the byte budget evicts entries and skips oversized values
+def test_max_bytes():
+    cache = LRUCache(max_entries=10, max_bytes=4)
+    cache.set("a", b"12")
+    cache.set("b", b"34")
+    cache.set("c", b"56")
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 4
+
+    cache.set("big", b"12345")
+    assert cache.get("big") is None
+
+# Test entries expire after their TTL
+def test_ttl_expiry():
+    cache = LRUCache(ttl=10)
+    with patch("app.utils.cache.time.monotonic", return_value=100.0):
+        cache.set("a", b"1")
+    with patch("app.utils.cache.time.monotonic", return_value=109.0):
+        assert cache.get("a") == b"1"
+    with patch("app.utils.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+# Test invalidate removes a single entry
+def test_invalidate():
+    cache = LRUCache()
+    cache.set("a", b"1")
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+# Test a set with a generation taken before an invalidation is dropped
+def test_set_after_invalidation_is_dropped():
+    cache = LRUCache()
+    generation = cache.generation()
+    cache.invalidate("a")
+    assert cache.set("a", b"old", generation=generation) is False
+    assert cache.get("a") is None
+
+    generation = cache.generation()
+    assert cache.set("a", b"new", generation=generation) is True
+    assert cache.get("a") == b"new"
+
+# Test replace decides whether a live entry is overwritten
+def test_set_replace_predicate():
+    cache = LRUCache()
+    cache.set("a", 2)
+    assert cache.set("a", 1, replace=lambda old, new: new >= old) is False
+    assert cache.get("a") == 2
+    assert cache.set("a", 3, replace=lambda old, new: new >= old) is True
+    assert cache.get("a") == 3
@@ -0,0 +1,74 @@
+import gzip
+import zlib
+import pytest
+from flask import Flask, Response, jsonify
+from app.middleware.compression import register_compression
+from app.utils.conditional import is_not_modified, not_modified_response, set_validators
+
+# Fixture for an app with a large, a small and a streamed JSON endpoint
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config["COMPRESSION_MIN_SIZE"] = 100
+
+    @app.route('/large')
+    def large():
+        response = jsonify({"data": [{"author": "alice", "title": "pin"}] * 50})
+        response.set_etag("abc")
+        return response
+
+    @app.route('/conditional')
+    def conditional():
+        if is_not_modified("v1"):
+            return not_modified_response("v1")
+        return set_validators(jsonify({"data": ["pin"] * 50}), "v1")
+
+    @app.route('/small')
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route('/stream')
+    def stream():
+        return Response((f'{{"id":{i}}}\n' for i in range(100)), mimetype='application/x-ndjson')
+
+    register_compression(app)
+    return app.test_client()
+
+# Test large bodies are gzipped with a weak ETag and Vary header
+def test_gzip_large_response(client):
+    response = client.get('/large', headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.headers["ETag"] == 'W/"abc"'
+    assert b'"author":"alice"' in gzip.decompress(response.get_data())
+
+# Test deflate is used when it is the only accepted coding
+def test_deflate(client):
+    response = client.get('/large', headers={"Accept-Encoding": "deflate"})
+    assert response.headers["Content-Encoding"] == "deflate"
+    assert b"alice" in zlib.decompress(response.get_data())
+
+# Test small bodies and clients without Accept-Encoding get identity responses
+def test_identity(client):
+    assert "Content-Encoding" not in client.get('/small', headers={"Accept-Encoding": "gzip"}).headers
+    response = client.get('/large')
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == '"abc"'
+
+# Test streamed responses are compressed chunk by chunk
+def test_streamed_response(client):
+    response = client.get('/stream', headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(response.get_data()).decode().splitlines()
+    assert len(lines) == 100
+    assert lines[-1] == '{"id":99}'
+
+# Test a compressed 200 and the 304 for the same resource carry the same ETag
+def test_conditional_etag_matches_when_compressed(client):
+    response = client.get('/conditional', headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    etag = response.headers["ETag"]
+
+    response = client.get('/conditional', headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
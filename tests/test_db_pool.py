@@ -0,0 +1,56 @@
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, exc, text
+from app import db
+from app.routes.internal import internal_bp
+from app.utils.db_pool import InstrumentedQueuePool, pool_engine_options, pool_status
+
+# Fixture for an engine with a single-connection instrumented pool
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.05)
+    yield engine
+    engine.dispose()
+
+# Test checkouts and checkout timeouts are counted
+def test_checkout_metrics(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        status = pool_status(engine)
+        assert status["checked_out"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    status = pool_status(engine)
+    assert status["pool"] == "InstrumentedQueuePool"
+    assert status["checked_out"] == 0
+    assert status["checkouts"] == 1
+    assert status["checkout_timeouts"] == 1
+    assert status["wait_seconds_max"] >= 0.05
+
+# Test engine options are built from the DB_POOL_* settings
+def test_pool_engine_options():
+    options = pool_engine_options({
+        "DB_POOL_SIZE": 5, "DB_MAX_OVERFLOW": 2, "DB_POOL_TIMEOUT": 3,
+        "DB_POOL_RECYCLE": 60, "DB_POOL_PRE_PING": True
+    })
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 5
+    assert options["pool_pre_ping"] is True
+
+# Test GET /internal/pool requires the API key
+def test_pool_endpoint():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["API_TOKEN"] = "test-token"
+    db.init_app(app)
+    app.register_blueprint(internal_bp, url_prefix='/internal')
+
+    with app.app_context():
+        client = app.test_client()
+        assert client.get('/internal/pool').status_code == 401
+        response = client.get('/internal/pool', headers={"X-API-Key": "test-token"})
+        assert response.status_code == 200
+        assert response.get_json()["data"]["pool"] == "StaticPool"
@@ -0,0 +1,88 @@
+import threading
+import pytest
+from app.utils.group_commit import GroupCommitQueue, QueueFullError
+
+# Test items submitted together are flushed as one batch and get their own results
+def test_batches_and_results():
+    batches = []
+
+    def flush(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    writer = GroupCommitQueue(flush, max_rows=10, max_delay=0.2)
+    futures = [writer.submit(i) for i in range(5)]
+    assert [future.result(timeout=2) for future in futures] == [0, 10, 20, 30, 40]
+    writer.close()
+    assert batches == [[0, 1, 2, 3, 4]]
+    assert writer.stats()["avg_batch_size"] == 5.0
+
+# Test a batch is written as soon as it reaches max_rows
+def test_max_rows_splits_batches():
+    batches = []
+    writer = GroupCommitQueue(lambda items: batches.append(len(items)) or items, max_rows=2, max_delay=5)
+    futures = [writer.submit(i) for i in range(4)]
+    for future in futures:
+        future.result(timeout=2)
+    writer.close()
+    assert batches == [2, 2]
+
+# Test every caller of a failed batch sees the flush error
+def test_flush_error_reaches_all_callers():
+    def flush(items):
+        raise RuntimeError("disk full")
+
+    writer = GroupCommitQueue(flush, max_rows=10, max_delay=0.1)
+    futures = [writer.submit(i) for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="disk full"):
+            future.result(timeout=2)
+    writer.close()
+    assert writer.stats()["batches"] == 0
+
+# Test one bad item in a batch fails only its own caller
+def test_bad_item_fails_alone():
+    batches = []
+
+    def flush(items):
+        if "bad" in items:
+            raise ValueError("bad row")
+        batches.append(list(items))
+        return [item.upper() for item in items]
+
+    writer = GroupCommitQueue(flush, max_rows=10, max_delay=0.1)
+    futures = [writer.submit(item) for item in ("a", "bad", "c")]
+    assert futures[0].result(timeout=2) == "A"
+    with pytest.raises(ValueError, match="bad row"):
+        futures[1].result(timeout=2)
+    assert futures[2].result(timeout=2) == "C"
+    writer.close()
+    assert batches == [["a"], ["c"]]
+    assert writer.stats()["items"] == 2
+
+# Test submissions beyond the queue size are rejected
+def test_rejects_when_full():
+    taken, release = threading.Event(), threading.Event()
+
+    def flush(items):
+        taken.set()
+        release.wait(5)
+        return items
+
+    writer = GroupCommitQueue(flush, max_rows=1, max_delay=0, max_queue=1)
+    first = writer.submit(1)
+    assert taken.wait(2)  # the flusher has taken the first item off the queue
+    second = writer.submit(2)
+    with pytest.raises(QueueFullError):
+        writer.submit(3)
+    assert writer.stats()["rejected"] == 1
+    release.set()
+    assert first.result(timeout=2) == 1 and second.result(timeout=2) == 2
+    writer.close()
+
+# Test close flushes what is still queued
+def test_close_flushes_pending():
+    writer = GroupCommitQueue(lambda items: items, max_rows=100, max_delay=10)
+    future = writer.submit("x")
+    writer.close()
+    assert future.result(timeout=0) == "x"
@@ -0,0 +1,58 @@
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from app.utils.hashing_pool import HashingPool, PoolSaturatedError, get_hashing_pool
+
+# Test run returns the worker's result
+def test_run_returns_result():
+    pool = HashingPool(workers=2, max_queue=2)
+    assert pool.run(pow, 2, 10) == 1024
+    assert pool.stats()["in_flight"] == 0
+    pool.shutdown()
+
+# Test submissions beyond workers + queue are rejected instead of queued
+def test_rejects_when_saturated():
+    pool = HashingPool(workers=1, max_queue=1)
+    release = threading.Event()
+    futures = [pool.submit(release.wait), pool.submit(release.wait)]
+
+    with pytest.raises(PoolSaturatedError):
+        pool.submit(release.wait)
+    assert pool.stats()["rejected"] == 1
+
+    release.set()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+    assert pool.stats()["in_flight"] == 0
+
+# Test an unknown pool kind is refused
+def test_invalid_kind():
+    with pytest.raises(ValueError):
+        HashingPool(kind="fiber")
+
+# Test concurrent first lookups share one pool per app
+def test_get_hashing_pool_created_once():
+    app = Flask(__name__)
+    barrier = threading.Barrier(8)
+    pools = []
+
+    def lookup():
+        with app.app_context():
+            barrier.wait()
+            pools.append(get_hashing_pool())
+
+    def slow_pool(**kwargs):
+        time.sleep(0.05)
+        return object()
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    with patch('app.utils.hashing_pool.HashingPool', side_effect=slow_pool) as factory:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert factory.call_count == 1
+    assert len({id(pool) for pool in pools}) == 1
@@ -0,0 +1,26 @@
+import json
+from datetime import datetime
+from flask import Flask
+from app.utils.json_provider import FastJSONProvider, join_fragments
+
+# Test dumps is compact, keeps key order and handles datetimes
+def test_dumps():
+    app = Flask(__name__)
+    provider = FastJSONProvider(app)
+    assert provider.dumps({"b": 1, "a": "é"}) == '{"b":1,"a":"é"}'
+    assert json.loads(provider.dumps({"when": datetime(2025, 1, 1)}))["when"].startswith("Wed, 01 Jan 2025")
+
+# Test responses go through the fast encoder
+def test_response():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    with app.app_context():
+        response = app.json.response({"b": 1, "a": 2})
+    assert response.get_data(as_text=True) == '{"b":1,"a":2}\n'
+
+# Test join_fragments builds a valid document around pre-encoded rows
+def test_join_fragments():
+    provider = FastJSONProvider(Flask(__name__))
+    body = join_fragments(provider.dumps, [b'{"id":1}', b'{"id":2}'], count=2, next=None)
+    assert json.loads(body) == {"data": [{"id": 1}, {"id": 2}], "count": 2, "next": None}
+    assert join_fragments(provider.dumps, []) == b'{"data":[]}'
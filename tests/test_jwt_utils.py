@@ -83,4 +83,30 @@ def test_verify_jwt_token_invalid(app_context):
     
     payload = verify_jwt_token(invalid_token, "access")
     
-    assert payload is None
\ No newline at end of file
+    assert payload is None
+
+# Test verify_jwt_token_cached verifies once and then serves repeats from the cache
+def test_verify_jwt_token_cached(app_context):
+    from unittest.mock import patch
+    from app.utils.jwt_utils import create_jwt_token, verify_jwt_token, verify_jwt_token_cached, token_cache_stats
+
+    token = create_jwt_token("123", "access")
+
+    with patch("app.utils.jwt_utils.verify_jwt_token", wraps=verify_jwt_token) as mock_verify:
+        first = verify_jwt_token_cached(token, "access")
+        second = verify_jwt_token_cached(token, "access")
+    assert first == second
+    assert first["sub"] == "123"
+    assert mock_verify.call_count == 1
+    assert token_cache_stats()["hits"] == 1
+
+    # A cached token still fails a type check, just like verify_jwt_token
+    assert verify_jwt_token_cached(token, "refresh") is None
+
+# Test verify_jwt_token_cached rejects the same tokens as verify_jwt_token
+def test_verify_jwt_token_cached_invalid(app_context):
+    from app.utils.jwt_utils import verify_jwt_token_cached, token_cache_stats
+
+    assert verify_jwt_token_cached("invalid.token.here", "access") is None
+    assert verify_jwt_token_cached("invalid.token.here", "access") is None
+    assert token_cache_stats()["entries"] == 0
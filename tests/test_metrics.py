@@ -0,0 +1,108 @@
+import pytest
+from flask import Flask, Response, abort, jsonify
+from app.middleware.metrics import register_metrics
+from app.routes.internal import internal_bp
+from app.utils.metrics import Histogram, RequestMetrics
+
+# Fixture for an app with metrics, a parametrised route and a streamed route
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["API_TOKEN"] = "test-key"
+
+    @app.route('/pins/<int:pin_id>', methods=['GET', 'POST'])
+    def get_pin(pin_id):
+        if pin_id == 0:
+            abort(404)
+        return jsonify({"id": pin_id})
+
+    @app.route('/stream')
+    def stream():
+        return Response((f"{i}\n" for i in range(3)), mimetype='text/plain')
+
+    register_metrics(app)
+    app.register_blueprint(internal_bp, url_prefix='/internal')
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def scrape(client):
+    response = client.get('/internal/metrics', headers={"X-API-Key": "test-key"})
+    assert response.status_code == 200
+    return response.get_data(as_text=True)
+
+# Test histogram buckets are rendered cumulatively with sum and count
+def test_histogram_render():
+    histogram = Histogram('h', 'Help.', ('route',), (1, 10))
+    for value in (0.5, 5, 50):
+        histogram.observe(('/a',), value)
+    lines = histogram.render()
+    assert 'h_bucket{route="/a",le="1"} 1' in lines
+    assert 'h_bucket{route="/a",le="10"} 2' in lines
+    assert 'h_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'h_sum{route="/a"} 55.500000' in lines
+    assert 'h_count{route="/a"} 3' in lines
+
+# Test label values are escaped
+def test_label_escaping():
+    histogram = Histogram('h', 'Help.', ('route',), (1,))
+    histogram.observe(('say "hi"\n',), 0)
+    assert 'h_count{route="say \\"hi\\"\\n"} 1' in histogram.render()
+
+# Test requests are labelled by URL rule and status
+def test_latency_by_rule_and_status(client):
+    client.get('/pins/1')
+    client.get('/pins/2')
+    client.get('/pins/0')
+    client.get('/missing')
+    text = scrape(client)
+    assert 'http_request_duration_seconds_count{method="GET",endpoint="/pins/<int:pin_id>",status="200"} 2' in text
+    assert 'http_request_duration_seconds_count{method="GET",endpoint="/pins/<int:pin_id>",status="404"} 1' in text
+    assert 'http_request_duration_seconds_count{method="GET",endpoint="unmatched",status="404"} 1' in text
+    assert '# TYPE http_request_duration_seconds histogram' in text
+
+# Test request and response sizes are recorded, skipping streamed bodies
+def test_sizes(client):
+    client.post('/pins/1', data=b"x" * 150)
+    client.get('/stream')
+    text = scrape(client)
+    assert 'http_request_size_bytes_bucket{method="POST",endpoint="/pins/<int:pin_id>",le="1000"} 1' in text
+    assert 'http_request_size_bytes_bucket{method="POST",endpoint="/pins/<int:pin_id>",le="100"} 0' in text
+    assert 'http_response_size_bytes_count{method="POST",endpoint="/pins/<int:pin_id>"} 1' in text
+    assert 'http_response_size_bytes_count{method="GET",endpoint="/stream"}' not in text
+
+# Test the in-flight gauge counts the scrape itself and returns to zero
+def test_in_flight(app, client):
+    assert 'http_requests_in_flight 1\n' in scrape(client)
+    assert app.extensions['metrics'].in_flight == 0
+
+# Test the gauge is released when a view raises
+def test_in_flight_after_exception(app, client):
+    @app.route('/boom')
+    def boom():
+        raise RuntimeError("boom")
+
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+    assert client.get('/boom').status_code == 500
+    assert app.extensions['metrics'].in_flight == 0
+
+# Test the endpoint requires the API key and uses the Prometheus content type
+def test_metrics_endpoint(client):
+    assert client.get('/internal/metrics').status_code == 401
+    response = client.get('/internal/metrics', headers={"X-API-Key": "test-key"})
+    assert response.content_type == 'text/plain; version=0.0.4; charset=utf-8'
+
+# Test nothing is collected when metrics are disabled
+def test_disabled():
+    app = Flask(__name__)
+    app.config.update(METRICS_ENABLED=False, API_TOKEN="test-key")
+    register_metrics(app)
+    app.register_blueprint(internal_bp, url_prefix='/internal')
+    assert 'metrics' not in app.extensions
+    assert app.test_client().get('/internal/metrics', headers={"X-API-Key": "test-key"}).status_code == 404
+
+# Test RequestMetrics renders an empty registry
+def test_empty_registry():
+    assert RequestMetrics().render().startswith("# HELP http_requests_in_flight")
@@ -0,0 +1,152 @@
+import io
+import json
+import pytest
+from unittest.mock import patch
+from datetime import datetime
+from flask import Flask
+from app.commands import register_commands
+from app.models.author_stats import AuthorStats
+from app.models.pin import Pin, db
+from app.models.pin_import import PinImport
+from app.utils.pin_io import RecordError, detect_format, read_pins
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    register_commands(app)
+    return app
+
+@pytest.fixture
+def setup_db(app):
+    with app.app_context():
+        db.create_all()
+        yield
+        db.session.remove()
+        db.drop_all()
+
+def ndjson(count, start=0):
+    return ''.join(json.dumps({"title": f"Pin {i}", "body": "b", "image_link": "http://example.com/i.jpg",
+                               "author": f"author{i % 3}", "date_created": f"2025-01-01T00:00:{i % 60:02d}"}) + '\n'
+                   for i in range(start, start + count))
+
+# Test the format is taken from the extension unless given
+def test_detect_format():
+    assert detect_format("pins.csv") == "csv"
+    assert detect_format("pins.jsonl") == "ndjson"
+    assert detect_format("pins.txt", "ndjson") == "ndjson"
+    with pytest.raises(ValueError):
+        detect_format("pins.txt")
+
+# Test CSV offsets point at the next record, even across quoted newlines
+def test_read_csv_offsets():
+    data = b'title,body,image_link,author\nA,"multi\nline",http://x/1.jpg,alice\nB,b,http://x/2.jpg,bob\n'
+    f = io.BytesIO(data)
+    records = list(read_pins(f, 'csv'))
+    assert [pin["title"] for pin, _ in records] == ["A", "B"]
+    assert records[0][0]["body"] == "multi\nline"
+    assert [pin["title"] for pin, _ in read_pins(f, 'csv', records[0][1])] == ["B"]
+
+# Test invalid records report their number
+def test_read_invalid_record():
+    f = io.BytesIO(ndjson(1).encode() + b'{"title": "no author"}\n')
+    with pytest.raises(RecordError, match="record 2: missing"):
+        list(read_pins(f, 'ndjson'))
+
+# Test non-string fields fail the import with their record number instead of crashing
+def test_import_non_string_field(app, setup_db, tmp_path):
+    path = tmp_path / "pins.ndjson"
+    path.write_text(ndjson(1) + json.dumps({"title": "t", "body": "b", "image_link": "l", "author": 5}) + "\n")
+    result = app.test_cli_runner(mix_stderr=False).invoke(args=["pins", "import", str(path)])
+    assert result.exit_code == 1
+    assert "record 2: author must be a string" in result.stderr
+
+# Test importing NDJSON in chunks fills pins and the author summary
+def test_import_ndjson(app, setup_db, tmp_path):
+    path = tmp_path / "pins.ndjson"
+    path.write_text(ndjson(25))
+    result = app.test_cli_runner(mix_stderr=False).invoke(args=["pins", "import", str(path), "--chunk-size", "10"])
+    assert result.exit_code == 0, result.output
+    assert "Imported 25 rows" in result.stderr and "rows/sec" in result.stderr
+    assert db.session.scalar(db.select(db.func.count(Pin.id))) == 25
+    assert db.session.get(AuthorStats, "author0").pin_count == 9
+    assert PinImport.get(str(path)) is None
+
+# Test a failed import resumes after the last committed chunk
+def test_import_resume(app, setup_db, tmp_path):
+    path = tmp_path / "pins.ndjson"
+    path.write_text(ndjson(12) + '{"title": "broken"}\n' + ndjson(3, start=12))
+    runner = app.test_cli_runner(mix_stderr=False)
+    result = runner.invoke(args=["pins", "import", str(path), "--chunk-size", "5"])
+    assert result.exit_code == 1
+    assert "record 13" in result.stderr
+    assert db.session.scalar(db.select(db.func.count(Pin.id))) == 10
+
+    path.write_text(ndjson(12) + ndjson(1, start=99) + ndjson(3, start=12))
+    result = runner.invoke(args=["pins", "import", str(path), "--chunk-size", "5"])
+    assert result.exit_code == 0, result.stderr
+    assert "Resuming after 10 rows" in result.stderr
+    titles = db.session.scalars(db.select(Pin.title)).all()
+    assert len(titles) == 16 and len(set(titles)) == 16
+
+# Test a chunk whose commit fails leaves neither its rows nor its progress behind
+def test_import_progress_commits_with_chunk(app, setup_db, tmp_path):
+    path = tmp_path / "pins.ndjson"
+    path.write_text(ndjson(12))
+    runner = app.test_cli_runner(mix_stderr=False)
+    record_added = AuthorStats.record_added
+    calls = []
+
+    def fail_second_chunk(groups):
+        calls.append(groups)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        record_added(groups)
+
+    with patch.object(AuthorStats, "record_added", fail_second_chunk):
+        result = runner.invoke(args=["pins", "import", str(path), "--chunk-size", "5"])
+    assert isinstance(result.exception, RuntimeError)
+    assert db.session.scalar(db.select(db.func.count(Pin.id))) == 5
+    assert PinImport.get(str(path)).row_count == 5
+
+    result = runner.invoke(args=["pins", "import", str(path), "--chunk-size", "5"])
+    assert result.exit_code == 0, result.stderr
+    titles = db.session.scalars(db.select(Pin.title)).all()
+    assert sorted(titles) == sorted(f"Pin {i}" for i in range(12))
+
+# Test --restart ignores recorded progress
+def test_import_restart(app, setup_db, tmp_path):
+    path = tmp_path / "pins.ndjson"
+    path.write_text(ndjson(3))
+    PinImport.record(str(path), len(ndjson(2)), 2)
+    db.session.commit()
+    result = app.test_cli_runner(mix_stderr=False).invoke(args=["pins", "import", str(path), "--restart"])
+    assert result.exit_code == 0, result.stderr
+    assert "Imported 3 rows" in result.stderr
+
+# Test export writes CSV that imports back unchanged
+def test_export_csv_round_trip(app, setup_db, tmp_path):
+    db.session.add_all(Pin(title=f"Pin {i}", body="line one\nline two", image_link="http://example.com/i.jpg",
+                           author="Alice", date_created=datetime(2025, 1, 1, 0, 0, i)) for i in range(3))
+    db.session.commit()
+    path = tmp_path / "pins.csv"
+    runner = app.test_cli_runner(mix_stderr=False)
+    result = runner.invoke(args=["pins", "export", str(path), "--batch-size", "2"])
+    assert result.exit_code == 0, result.stderr
+    assert "Exported 3 rows" in result.stderr
+
+    records = [pin for pin, _ in read_pins(open(path, 'rb'), 'csv')]
+    assert [pin["title"] for pin in records] == ["Pin 0", "Pin 1", "Pin 2"]
+    assert records[0]["body"] == "line one\nline two"
+    assert records[2]["date_created"] == datetime(2025, 1, 1, 0, 0, 2)
+
+# Test export to stdout defaults to NDJSON and honours --author
+def test_export_stdout(app, setup_db):
+    db.session.add_all([Pin(title="a", body="b", image_link="http://example.com/i.jpg", author=name,
+                            date_created=datetime(2025, 1, 1)) for name in ("Alice", "Bob")])
+    db.session.commit()
+    result = app.test_cli_runner(mix_stderr=False).invoke(args=["pins", "export", "-", "--author", "bob"])
+    lines = result.stdout.splitlines()
+    assert len(lines) == 1 and json.loads(lines[0])["author"] == "Bob"
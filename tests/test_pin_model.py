@@ -1,7 +1,13 @@
+import json
+import threading
+import time
+from collections import namedtuple
 import pytest
+from unittest.mock import patch
 from datetime import datetime
 from flask import Flask
-from app.models.pin import Pin, db  
+from sqlalchemy import event, inspect
+from app.models.pin import Pin, VersionConflictError, db, get_pin_writer
 
 @pytest.fixture
 def app():
@@ -144,4 +150,338 @@ async def test_delete_pin(setup_db, pin_data):
 @pytest.mark.asyncio
 async def test_delete_pin_invalid(setup_db):
     result = await Pin.delete(999)
-    assert result is False
\ No newline at end of file
+    assert result is False
+
+# Test Pin.get_page walks forwards and backwards over (date_created, id)
+@pytest.mark.asyncio
+async def test_get_page_keyset(setup_db, pin_data):
+    for i in range(5):
+        db.session.add(Pin(**{**pin_data, "title": f"Pin {i}", "date_created": datetime(2025, 1, 1 + i // 2)}))
+    db.session.commit()
+
+    first, has_more = await Pin.get_page(order_dir="desc", limit=2)
+    assert [p.title for p in first] == ["Pin 4", "Pin 3"]
+    assert has_more is True
+
+    after = (first[-1].date_created, first[-1].id)
+    second, has_more = await Pin.get_page(order_dir="desc", limit=2, after=after)
+    assert [p.title for p in second] == ["Pin 2", "Pin 1"]
+    assert has_more is True
+
+    before = (second[0].date_created, second[0].id)
+    back, has_more = await Pin.get_page(order_dir="desc", limit=2, after=before, backwards=True)
+    assert [p.title for p in back] == ["Pin 4", "Pin 3"]
+    assert has_more is False
+
+    asc_page, has_more = await Pin.get_page(order_dir="asc", limit=10)
+    assert [p.title for p in asc_page] == [f"Pin {i}" for i in range(5)]
+    assert has_more is False
+
+# Test Pin.get_page combined with the author filter
+@pytest.mark.asyncio
+async def test_get_page_author_filter(setup_db, pin_data):
+    db.session.add_all([Pin(**pin_data), Pin(**{**pin_data, "author": "Bob"})])
+    db.session.commit()
+
+    pins, has_more = await Pin.get_page(author_filter="bob", limit=10)
+    assert [p.author for p in pins] == ["Bob"]
+    assert has_more is False
+
+# Test Pin.iter_all streams every matching pin in order
+def test_iter_all(setup_db, pin_data):
+    for i in range(5):
+        db.session.add(Pin(**{**pin_data, "title": f"Pin {i}"}))
+    db.session.commit()
+
+    pins = list(Pin.iter_all(order_dir="asc", batch_size=2))
+    assert [p.title for p in pins] == [f"Pin {i}" for i in range(5)]
+
+# Test author_norm follows author and drives the author filter
+@pytest.mark.asyncio
+async def test_author_norm_maintained(setup_db, pin_data):
+    pin = await Pin.create({**pin_data, "author": "ALICE"})
+    assert pin.author_norm == "alice"
+
+    await Pin.update(pin.id, {**pin_data, "author": "Bob"})
+    assert pin.author_norm == "bob"
+
+    pins = await Pin.get_all(author_filter="BOB")
+    assert [p.id for p in pins] == [pin.id]
+
+# Test Pin.get_payload_by_id reads through the cache and is invalidated by update
+@pytest.mark.asyncio
+async def test_get_payload_by_id_cache(setup_db, pin_data):
+    pin = await Pin.create(pin_data)
+
+    first = await Pin.get_payload_by_id(pin.id)
+    second = await Pin.get_payload_by_id(pin.id)
+    assert first == second
+    assert json.loads(first.payload)["title"] == "Test Pin"
+    assert Pin.cache_stats()["hits"] == 1
+
+    await Pin.update(pin.id, {**pin_data, "title": "Updated Pin"})
+    assert json.loads((await Pin.get_payload_by_id(pin.id)).payload)["title"] == "Updated Pin"
+
+    await Pin.delete(pin.id)
+    assert await Pin.get_payload_by_id(pin.id) is None
+
+# Test a row read before a concurrent update commits is not left in the cache
+@pytest.mark.asyncio
+async def test_get_payload_by_id_racing_update(setup_db, pin_data):
+    pin = await Pin.create(pin_data)
+
+    class RacingRepository:
+        async def get_by_id(self, pin_id):
+            old = Pin(id=pin.id, version=pin.version, updated_at=pin.updated_at,
+                      **{key: getattr(pin, key) for key in ("title", "body", "image_link", "author", "date_created")})
+            await Pin.update(pin_id, {**pin_data, "title": "Updated Pin"})
+            return old
+
+    stale = await Pin.get_payload_by_id(pin.id, repository=RacingRepository())
+    assert json.loads(stale.payload)["title"] == "Test Pin"
+    fresh = await Pin.get_payload_by_id(pin.id)
+    assert json.loads(fresh.payload)["title"] == "Updated Pin"
+    assert await Pin.get_validators(pin.id) == (2, fresh.updated_at)
+
+# Test Pin.update bumps version and updated_at used for conditional requests
+@pytest.mark.asyncio
+async def test_update_bumps_version(setup_db, pin_data):
+    pin = await Pin.create(pin_data)
+    assert pin.version == 1
+    assert await Pin.get_validators(pin.id) == (1, pin.updated_at)
+
+    before = await Pin.get_collection_version()
+    await Pin.update(pin.id, {**pin_data, "title": "Updated Pin"})
+    assert pin.version == 2
+    assert (await Pin.get_validators(pin.id))[0] == 2
+    assert await Pin.get_collection_version() != before
+    assert await Pin.get_validators(999) is None
+
+# Test the collection version follows deletes of an author's pins without counting pins
+@pytest.mark.asyncio
+async def test_collection_version_reads_no_pin_count(setup_db, pin_data):
+    pin = await Pin.create(pin_data)
+    await Pin.create({**pin_data, "author": "Bob"})
+    statements = []
+    engine = db.session.get_bind()
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        before = await Pin.get_collection_version(author_filter="alice")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert before.count == 1
+    assert not any("count(" in statement.lower() and "FROM pins" in statement for statement in statements)
+
+    await Pin.delete(pin.id)
+    assert await Pin.get_collection_version(author_filter="alice") != before
+
+# Test Pin.bulk_create inserts in chunks and returns ids in input order
+@pytest.mark.asyncio
+async def test_bulk_create(setup_db, pin_data):
+    pins_data = [{**pin_data, "title": f"Pin {i}"} for i in range(5)]
+    ids = await Pin.bulk_create(pins_data, chunk_size=2)
+    assert len(ids) == 5
+    assert [db.session.get(Pin, pin_id).title for pin_id in ids] == [f"Pin {i}" for i in range(5)]
+    assert db.session.get(Pin, ids[0]).author_norm == "alice"
+
+# Test Pin.bulk_create sends one multi-row INSERT per chunk without executemany RETURNING
+@pytest.mark.asyncio
+async def test_bulk_create_without_returning(setup_db, pin_data):
+    engine = db.session.get_bind()
+    inserts = []
+
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO pins "):
+            inserts.append(executemany)
+
+    event.listen(engine, "before_cursor_execute", count_inserts)
+    try:
+        with patch.object(engine.dialect, "insert_executemany_returning_sort_by_parameter_order", False):
+            ids = await Pin.bulk_create([{**pin_data, "title": f"Pin {i}"} for i in range(3)], chunk_size=2)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_inserts)
+    assert inserts == [False, False]
+    assert [db.session.get(Pin, pin_id).title for pin_id in ids] == ["Pin 0", "Pin 1", "Pin 2"]
+
+# Test ids of a multi-row INSERT are derived from lastrowid the way each dialect reports it
+def test_inserted_ids():
+    result = namedtuple("Result", "lastrowid")
+    assert list(Pin._inserted_ids(result(11), "mysql", 3, 2)) == [11, 13, 15]
+    assert list(Pin._inserted_ids(result(7), "sqlite", 3, 1)) == [5, 6, 7]
+
+# Test Pin.bulk_update changes matching rows and bumps their version
+@pytest.mark.asyncio
+async def test_bulk_update(setup_db, pin_data):
+    ids = await Pin.bulk_create([pin_data, {**pin_data, "author": "Bob"}, pin_data])
+
+    assert await Pin.bulk_update({"title": "Renamed"}, author="ALICE") == 2
+    assert await Pin.bulk_update({"author": "Carol"}, ids=[ids[1]]) == 1
+
+    db.session.expire_all()
+    pins = [db.session.get(Pin, pin_id) for pin_id in ids]
+    assert [p.title for p in pins] == ["Renamed", "Test Pin", "Renamed"]
+    assert [p.version for p in pins] == [2, 2, 2]
+    assert pins[1].author_norm == "carol"
+
+# Test bulk_update and bulk_delete refuse to run without ids or a filter
+@pytest.mark.asyncio
+async def test_bulk_without_selector(setup_db, pin_data):
+    await Pin.bulk_create([pin_data, pin_data])
+    with pytest.raises(ValueError):
+        await Pin.bulk_update({"title": "Renamed"})
+    with pytest.raises(ValueError):
+        await Pin.bulk_delete(author=None)
+    assert Pin.query.filter_by(title="Test Pin").count() == 2
+
+# Test Pin.bulk_delete removes rows by id list or date range
+@pytest.mark.asyncio
+async def test_bulk_delete(setup_db, pin_data):
+    ids = await Pin.bulk_create([{**pin_data, "date_created": datetime(2025, 1, day)} for day in (1, 2, 3)])
+
+    assert await Pin.bulk_delete(created_after=datetime(2025, 1, 2), created_before=datetime(2025, 1, 3)) == 1
+    assert await Pin.bulk_delete(ids=[ids[0], 999]) == 1
+    assert [p.id for p in Pin.query.all()] == [ids[2]]
+
+# Test Pin.get_page with fields leaves the body column unloaded
+@pytest.mark.asyncio
+async def test_get_page_fields_defers_body(setup_db, pin_data):
+    await Pin.create(pin_data)
+    db.session.expunge_all()
+
+    pins, _ = await Pin.get_page(limit=10, fields=("id", "title"))
+    assert "body" in inspect(pins[0]).unloaded
+    assert pins[0].to_dict(("id", "title")) == {"id": pins[0].id, "title": "Test Pin"}
+
+# Test Pin.get_fields_by_id projects cached and uncached pins alike
+@pytest.mark.asyncio
+async def test_get_fields_by_id(setup_db, pin_data):
+    pin_id = (await Pin.create(pin_data)).id
+    db.session.expunge_all()
+
+    data, version, _ = await Pin.get_fields_by_id(pin_id, ("title", "author"))
+    assert data == {"title": "Test Pin", "author": "Alice"}
+    assert version == 1
+
+    await Pin.get_payload_by_id(pin_id)
+    data, _, _ = await Pin.get_fields_by_id(pin_id, ("id",))
+    assert data == {"id": pin_id}
+    assert await Pin.get_fields_by_id(999, ("id",)) is None
+
+# Test Pin.search ranks matches and follows create, update and delete
+@pytest.mark.asyncio
+async def test_search(setup_db, pin_data):
+    sunset = await Pin.create({**pin_data, "title": "Sunset", "body": "Beach sunset sunset photos"})
+    beach = await Pin.create({**pin_data, "title": "Beach", "body": "Sandy beach with a sunset"})
+    await Pin.create({**pin_data, "title": "Forest", "body": "Tall trees"})
+
+    pins, has_more = await Pin.search("sunset")
+    assert [p.id for p in pins] == [sunset.id, beach.id]
+    assert has_more is False
+
+    pins, _ = await Pin.search("beach SUNSET")
+    assert {p.id for p in pins} == {sunset.id, beach.id}
+
+    await Pin.update(beach.id, {**pin_data, "title": "Beach", "body": "Sandy beach"})
+    await Pin.delete(sunset.id)
+    assert (await Pin.search("sunset"))[0] == []
+    assert [p.id for p in (await Pin.search("sandy"))[0]] == [beach.id]
+
+    # FTS operators in user input are treated as plain words
+    assert (await Pin.search('"OR*')) == ([], False)
+
+# Test Pin.payloads_for reuses cached fragments until the pin's version changes
+@pytest.mark.asyncio
+async def test_payloads_for(setup_db, pin_data):
+    pin = await Pin.create(pin_data)
+
+    first = Pin.payloads_for([pin])
+    assert Pin.payloads_for([pin]) == first
+    assert Pin.cache_stats()["hits"] == 1
+
+    pin.title = "Changed"
+    pin.version += 1
+    db.session.commit()
+    assert json.loads(Pin.payloads_for([pin])[0])["title"] == "Changed"
+
+# Test Pin.payloads_for never replaces a newer cached version or caches across an invalidation
+@pytest.mark.asyncio
+async def test_payloads_for_keeps_newer_versions(setup_db, pin_data):
+    pin = await Pin.create(pin_data)
+    generation = Pin.cache_generation()
+    old = Pin(id=pin.id, version=1, updated_at=pin.updated_at,
+              **{key: getattr(pin, key) for key in ("title", "body", "image_link", "author", "date_created")})
+    await Pin.update(pin.id, {**pin_data, "title": "Updated Pin"})
+
+    assert json.loads(Pin.payloads_for([old], generation)[0])["title"] == "Test Pin"
+    assert (await Pin.get_payload_by_id(pin.id)).version == 2
+
+    assert json.loads(Pin.payloads_for([old])[0])["title"] == "Test Pin"
+    assert json.loads((await Pin.get_payload_by_id(pin.id)).payload)["title"] == "Updated Pin"
+
+# Test Pin.patch updates only when the version matches
+@pytest.mark.asyncio
+async def test_patch(setup_db, pin_data):
+    pin_id = (await Pin.create(pin_data)).id
+
+    version, _ = await Pin.patch(pin_id, {"title": "Patched", "author": "Bob"}, version=1)
+    assert version == 2
+
+    with pytest.raises(VersionConflictError) as exc_info:
+        await Pin.patch(pin_id, {"title": "Stale"}, version=1)
+    assert exc_info.value.current_version == 2
+
+    db.session.expire_all()
+    pin = db.session.get(Pin, pin_id)
+    assert (pin.title, pin.author_norm, pin.body) == ("Patched", "bob", pin_data["body"])
+    assert await Pin.patch(999, {"title": "x"}, version=1) is None
+
+# Test Pin.count reads totals from the author summary and serves repeats from the cache
+@pytest.mark.asyncio
+async def test_count(setup_db, pin_data):
+    await Pin.bulk_create([pin_data, {**pin_data, "author": "alice"}, {**pin_data, "author": "Bob"}])
+    assert await Pin.count() == (3, True)
+    assert await Pin.count(author_filter="ALICE") == (2, True)
+    assert await Pin.count(author_filter="nobody") == (0, True)
+
+    # Cached totals are flagged inexact until a local write drops them
+    assert await Pin.count(author_filter="alice") == (2, False)
+    await Pin.create({**pin_data, "author": "Alice"})
+    assert await Pin.count(author_filter="alice") == (3, True)
+    assert await Pin.count(exact=True) == (4, True)
+
+# Test Pin.search_count caps estimates and counts exactly on request
+@pytest.mark.asyncio
+async def test_search_count(setup_db, pin_data):
+    await Pin.bulk_create([{**pin_data, "title": f"Sunset {i}"} for i in range(5)])
+    assert await Pin.search_count("sunset", cap=10) == (5, True)
+    assert await Pin.search_count("sunset", cap=3) == (3, False)
+    assert await Pin.search_count("sunset", exact=True, cap=3) == (5, True)
+    assert await Pin.search_count("!!") == (0, True)
+
+# Test concurrent first lookups share one write-behind queue
+def test_get_pin_writer_created_once(app):
+    app.config["PIN_WRITE_BEHIND"] = True
+    barrier = threading.Barrier(8)
+    writers = []
+
+    def lookup():
+        with app.app_context():
+            barrier.wait()
+            writers.append(get_pin_writer())
+
+    def slow_queue(*args, **kwargs):
+        time.sleep(0.05)
+        return object()
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    with patch('app.models.pin.GroupCommitQueue', side_effect=slow_queue) as factory:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert factory.call_count == 1
+    assert len({id(writer) for writer in writers}) == 1
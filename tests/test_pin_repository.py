@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.models.pin import Pin, db
+from app.models.pin_repository import AsyncPinRepository
+from app.routes.pins import pins_bp
+
+# Fixture for a file-backed SQLite database shared by the sync and async engines
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "pins.db"
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    engine.dispose()
+    return path
+
+@pytest_asyncio.fixture
+async def repository(db_path):
+    repository = AsyncPinRepository(f"sqlite+aiosqlite:///{db_path}")
+    yield repository
+    await repository.dispose()
+
+@pytest.fixture
+def pin_data():
+    return {
+        "title": "Test Pin",
+        "body": "This is a test pin.",
+        "image_link": "http://example.com/image.jpg",
+        "author": "Alice",
+        "date_created": datetime(2025, 1, 1, 12, 0, 0)
+    }
+
+# Insert pins through a sync engine and return their ids
+def seed(db_path, pins_data):
+    engine = create_engine(f"sqlite:///{db_path}")
+    with Session(engine) as session:
+        pins = [Pin(**data) for data in pins_data]
+        session.add_all(pins)
+        session.commit()
+        ids = [pin.id for pin in pins]
+    engine.dispose()
+    return ids
+
+# Test get_by_id reads through the async engine
+@pytest.mark.asyncio
+async def test_get_by_id(repository, db_path, pin_data):
+    pin_id, = seed(db_path, [pin_data])
+    fetched = await repository.get_by_id(pin_id)
+    assert fetched.title == "Test Pin"
+    assert fetched.author_norm == "alice"
+    assert await repository.get_by_id(pin_id + 1) is None
+
+# Test the pooled engine serves requests made from different event loops
+def test_pool_shared_across_loops(db_path, pin_data):
+    pin_id, = seed(db_path, [pin_data])
+    repository = AsyncPinRepository(f"sqlite+aiosqlite:///{db_path}", pool_size=1, max_overflow=0)
+    for _ in range(3):
+        assert asyncio.run(repository.get_by_id(pin_id)).id == pin_id
+    assert repository.engine.pool.checkedin() == 1
+    asyncio.run(repository.dispose())
+
+# Test get_page matches the keyset semantics of Pin.get_page
+@pytest.mark.asyncio
+async def test_get_page(repository, db_path, pin_data):
+    seed(db_path, [{**pin_data, "title": f"Pin {i}", "author": "Bob" if i == 1 else "Alice"} for i in range(3)])
+
+    pins, has_more = await repository.get_page(order_dir="asc", limit=2)
+    assert [p.title for p in pins] == ["Pin 0", "Pin 1"]
+    assert has_more is True
+
+    pins, has_more = await repository.get_page(author_filter="alice", order_dir="asc", limit=2,
+                                               after=(pins[0].date_created, pins[0].id))
+    assert [p.title for p in pins] == ["Pin 2"]
+    assert has_more is False
+
+# Test the pin routes read through the repository when ASYNC_DATABASE_URI is set
+def test_routes_use_repository(db_path, pin_data):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config["ASYNC_DATABASE_URI"] = f"sqlite+aiosqlite:///{db_path}"
+    db.init_app(app)
+    app.register_blueprint(pins_bp, url_prefix='/api')
+
+    with app.app_context():
+        pin = Pin(**pin_data)
+        db.session.add(pin)
+        db.session.commit()
+
+        client = app.test_client()
+        assert client.get('/api/pins').get_json()["data"][0]["title"] == "Test Pin"
+        assert client.get(f'/api/pins/{pin.id}').get_json()["data"]["id"] == pin.id
+        db.session.remove()
+        asyncio.run(app.extensions['pin_repository'].dispose())
@@ -1,3 +1,5 @@
+import asyncio
+import json
 import pytest
 from flask import Flask
 from app.routes.pins import pins_bp  
@@ -46,6 +48,13 @@ def mock_authenticate():
         mock_verify.return_value = {"user_id": 1}  
         yield mock_verify
 
+# Patch token verification where the authenticate decorator looks it up
+@pytest.fixture
+def auth_headers():
+    with patch('app.middleware.auth.verify_jwt_token_cached') as mock_verify:
+        mock_verify.return_value = {"sub": "1", "type": "access"}
+        yield {"Authorization": "Bearer valid_token"}
+
 # Test GET /pins 
 def test_get_pins(client, pin_data):
     pin = Pin(**pin_data)
@@ -104,6 +113,19 @@ def test_update_pin(client, pin_data, mock_authenticate):
     response = client.put(f'/api/pins/{pin.id}', json=updated_data, headers=headers)
     assert response.status_code == 200
 
+# Test POST and PUT reject values that are not non-empty strings
+def test_create_and_update_pin_invalid_values(client, pin_data, auth_headers):
+    pin = Pin(**pin_data)
+    db.session.add(pin)
+    db.session.commit()
+
+    payload = {key: pin_data[key] for key in ("title", "body", "image_link", "author")}
+    for changes in ({"author": 5}, {"title": None}, {"body": ""}):
+        assert client.post('/api/pins', json={**payload, **changes}, headers=auth_headers).status_code == 400
+        assert client.put(f'/api/pins/{pin.id}', json=changes, headers=auth_headers).status_code == 400
+    assert Pin.query.count() == 1
+    assert db.session.get(Pin, pin.id).version == 1
+
 # Test PUT /pins/<pin_id> with invalid JSON
 def test_update_pin_invalid_json(client, pin_data, mock_authenticate):
     pin = Pin(**pin_data)
@@ -128,4 +150,286 @@ def test_delete_pin(client, pin_data, mock_authenticate):
 def test_delete_pin_not_found(client, mock_authenticate):
     headers = {"Authorization": "Bearer valid_token"}
     response = client.delete('/api/pins/999', headers=headers)
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+# Test GET /pins pages through results with next/prev cursors
+def test_get_pins_cursor_pagination(client, pin_data):
+    for i in range(5):
+        db.session.add(Pin(**{**pin_data, "title": f"Pin {i}"}))
+    db.session.commit()
+
+    first = client.get('/api/pins?limit=2&order_dir=asc').get_json()
+    assert [p["title"] for p in first["data"]] == ["Pin 0", "Pin 1"]
+    assert first["prev"] is None
+
+    second = client.get(f'/api/pins?limit=2&order_dir=asc&cursor={first["next"]}').get_json()
+    assert [p["title"] for p in second["data"]] == ["Pin 2", "Pin 3"]
+
+    back = client.get(f'/api/pins?limit=2&order_dir=asc&cursor={second["prev"]}').get_json()
+    assert [p["title"] for p in back["data"]] == ["Pin 0", "Pin 1"]
+    assert back["prev"] is None
+
+    last = client.get(f'/api/pins?limit=2&order_dir=asc&cursor={second["next"]}').get_json()
+    assert [p["title"] for p in last["data"]] == ["Pin 4"]
+    assert last["next"] is None
+
+# Test GET /pins rejects bad limit and cursor values
+def test_get_pins_invalid_pagination(client):
+    assert client.get('/api/pins?limit=0').status_code == 400
+    assert client.get('/api/pins?limit=abc').status_code == 400
+    assert client.get('/api/pins?cursor=not-a-cursor').status_code == 400
+
+# Test a cursor is only accepted with the order_dir and author it was issued for
+def test_get_pins_cursor_bound_to_listing(client, pin_data):
+    db.session.add_all([Pin(**{**pin_data, "title": f"Pin {i}"}) for i in range(3)])
+    db.session.commit()
+
+    cursor = client.get('/api/pins?limit=1&order_dir=asc&author=alice').get_json()["next"]
+    assert client.get(f'/api/pins?limit=1&order_dir=asc&author=ALICE&cursor={cursor}').status_code == 200
+    assert client.get(f'/api/pins?limit=1&order_dir=desc&author=alice&cursor={cursor}').status_code == 400
+    assert client.get(f'/api/pins?limit=1&order_dir=asc&cursor={cursor}').status_code == 400
+    assert client.get(f'/api/pins?limit=1&order_dir=asc&author=bob&cursor={cursor}').status_code == 400
+
+# Test GET /pins?stream=1 returns every pin as NDJSON
+def test_get_pins_stream(client, pin_data):
+    for i in range(3):
+        db.session.add(Pin(**{**pin_data, "title": f"Pin {i}"}))
+    db.session.commit()
+
+    response = client.get('/api/pins?stream=1&order_dir=asc')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [p["title"] for p in lines] == ["Pin 0", "Pin 1", "Pin 2"]
+
+# Test GET /pins selects streaming from the Accept header
+def test_get_pins_stream_accept_header(client, pin_data):
+    db.session.add_all([Pin(**pin_data), Pin(**{**pin_data, "author": "Bob"})])
+    db.session.commit()
+
+    response = client.get('/api/pins?author=bob', headers={"Accept": "application/x-ndjson"})
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["author"] == "Bob"
+
+# Test GET /pins/<pin_id> answers If-None-Match with 304 until the pin changes
+def test_get_pin_conditional(client, pin_data):
+    pin = Pin(**pin_data)
+    db.session.add(pin)
+    db.session.commit()
+
+    response = client.get(f'/api/pins/{pin.id}')
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+
+    response = client.get(f'/api/pins/{pin.id}', headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.get_data() == b""
+
+    asyncio.run(Pin.update(pin.id, {**pin_data, "title": "Changed"}))
+    response = client.get(f'/api/pins/{pin.id}', headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+# Test GET /pins answers If-None-Match with 304 until the page changes
+def test_get_pins_conditional(client, pin_data):
+    db.session.add(Pin(**pin_data))
+    db.session.commit()
+
+    etag = client.get('/api/pins?limit=5').headers["ETag"]
+    assert client.get('/api/pins?limit=5', headers={"If-None-Match": etag}).status_code == 304
+
+    db.session.add(Pin(**{**pin_data, "title": "New Pin"}))
+    db.session.commit()
+    assert client.get('/api/pins?limit=5', headers={"If-None-Match": etag}).status_code == 200
+
+    stream_etag = client.get('/api/pins?stream=1').headers["ETag"]
+    assert client.get('/api/pins?stream=1', headers={"If-None-Match": stream_etag}).status_code == 304
+
+# Test POST /pins/batch inserts every pin and returns their ids
+def test_create_pins_batch(client, pin_data, auth_headers):
+    items = [{"title": f"Pin {i}", "body": "b", "image_link": "http://example.com/i.jpg", "author": "Alice"}
+             for i in range(3)]
+    response = client.post('/api/pins/batch', json=items, headers=auth_headers)
+    assert response.status_code == 201
+    results = response.get_json()["data"]
+    assert [r["index"] for r in results] == [0, 1, 2]
+    ids = [r["id"] for r in results]
+    assert [db.session.get(Pin, pin_id).title for pin_id in ids] == ["Pin 0", "Pin 1", "Pin 2"]
+
+# Test POST /pins/batch accepts NDJSON bodies
+def test_create_pins_batch_ndjson(client, auth_headers):
+    body = "\n".join(json.dumps({"title": f"Pin {i}", "body": "b", "image_link": "l", "author": "Bob"})
+                     for i in range(2))
+    response = client.post('/api/pins/batch', data=body, headers={**auth_headers, "Content-Type": "application/x-ndjson"})
+    assert response.status_code == 201
+    assert response.get_json()["count"] == 2
+
+# Test POST /pins/batch rejects the whole batch when any item is invalid
+def test_create_pins_batch_invalid_item(client, auth_headers):
+    items = [{"title": "ok", "body": "b", "image_link": "l", "author": "Bob"}, {"title": "missing"}]
+    response = client.post('/api/pins/batch', json=items, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.get_json()["results"] == [{"index": 1, "status": "invalid"}]
+    assert Pin.query.count() == 0
+
+# Test POST /pins/batch reports items whose values are not non-empty strings
+def test_create_pins_batch_invalid_values(client, auth_headers):
+    item = {"title": "ok", "body": "b", "image_link": "l", "author": "Bob"}
+    items = [item, {**item, "author": 5}, {**item, "title": ""}, item]
+    response = client.post('/api/pins/batch', json=items, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.get_json()["results"] == [{"index": 1, "status": "invalid"}, {"index": 2, "status": "invalid"}]
+    assert Pin.query.count() == 0
+
+# Test PATCH /pins/batch updates pins selected by author
+def test_update_pins_batch(client, pin_data, auth_headers):
+    db.session.add_all([Pin(**pin_data), Pin(**pin_data), Pin(**{**pin_data, "author": "Bob"})])
+    db.session.commit()
+
+    body = {"filter": {"author": "alice"}, "changes": {"title": "Renamed"}}
+    response = client.patch('/api/pins/batch', json=body, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json()["count"] == 2
+
+# Test DELETE /pins/batch deletes pins by id and validates the selector
+def test_delete_pins_batch(client, pin_data, auth_headers):
+    pins = [Pin(**pin_data) for _ in range(3)]
+    db.session.add_all(pins)
+    db.session.commit()
+
+    response = client.delete('/api/pins/batch', json={"ids": [pins[0].id, pins[1].id]}, headers=auth_headers)
+    assert response.get_json()["count"] == 2
+    assert Pin.query.count() == 1
+
+    assert client.delete('/api/pins/batch', json={}, headers=auth_headers).status_code == 400
+    assert client.delete('/api/pins/batch', json={"filter": {"title": "x"}}, headers=auth_headers).status_code == 400
+
+# Test batch filters with an empty or null author are rejected instead of matching every pin
+def test_pins_batch_rejects_empty_author_filter(client, pin_data, auth_headers):
+    db.session.add_all([Pin(**pin_data), Pin(**pin_data)])
+    db.session.commit()
+
+    for author in ("", None, 5):
+        body = {"filter": {"author": author}}
+        assert client.delete('/api/pins/batch', json=body, headers=auth_headers).status_code == 400
+        body["changes"] = {"title": "Renamed"}
+        assert client.patch('/api/pins/batch', json=body, headers=auth_headers).status_code == 400
+    assert Pin.query.filter_by(title="Test Pin").count() == 2
+
+# Test PATCH /pins/batch rejects changes that are not non-empty strings
+def test_update_pins_batch_invalid_values(client, pin_data, auth_headers):
+    db.session.add(Pin(**pin_data))
+    db.session.commit()
+
+    for changes in ({"title": None}, {"author": None}, {"author": 5}, {"body": ""}):
+        body = {"filter": {"author": "alice"}, "changes": changes}
+        assert client.patch('/api/pins/batch', json=body, headers=auth_headers).status_code == 400
+
+# Test ?fields= selects columns on the list and detail endpoints
+def test_get_pins_sparse_fields(client, pin_data):
+    pin = Pin(**pin_data)
+    db.session.add(pin)
+    db.session.commit()
+
+    data = client.get('/api/pins?fields=title,id').get_json()["data"]
+    assert data == [{"id": pin.id, "title": "Test Pin"}]
+
+    data = client.get(f'/api/pins/{pin.id}?fields=author').get_json()["data"]
+    assert data == {"author": "Alice"}
+
+    assert client.get('/api/pins?fields=title,password').status_code == 400
+
+# Test GET /pins/search pages through full-text matches
+def test_search_pins(client, pin_data):
+    db.session.add_all([Pin(**{**pin_data, "title": f"Mountain {i}"}) for i in range(3)])
+    db.session.add(Pin(**{**pin_data, "title": "River"}))
+    db.session.commit()
+
+    first = client.get('/api/pins/search?q=mountain&limit=2').get_json()
+    assert first["count"] == 2
+    assert first["next_offset"] == 2
+
+    rest = client.get('/api/pins/search?q=mountain&limit=2&offset=2').get_json()
+    assert rest["count"] == 1
+    assert rest["next_offset"] is None
+
+    assert client.get('/api/pins/search').status_code == 400
+    assert client.get('/api/pins/search?q=x&offset=-1').status_code == 400
+
+# Test PATCH /pins/<pin_id> applies changes once and answers 409 for a stale version
+def test_patch_pin(client, pin_data, auth_headers):
+    pin = Pin(**pin_data)
+    db.session.add(pin)
+    db.session.commit()
+
+    response = client.patch(f'/api/pins/{pin.id}', json={"title": "Patched", "version": 1}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json()["data"]["version"] == 2
+    assert response.headers["ETag"]
+
+    response = client.patch(f'/api/pins/{pin.id}', json={"title": "Stale", "version": 1}, headers=auth_headers)
+    assert response.status_code == 409
+
+    assert client.patch(f'/api/pins/{pin.id}', json={"title": "x"}, headers=auth_headers).status_code == 400
+    assert client.patch('/api/pins/999', json={"title": "x", "version": 1}, headers=auth_headers).status_code == 404
+
+# Test PATCH /pins/<pin_id> rejects values that are not non-empty strings
+def test_patch_pin_invalid_values(client, pin_data, auth_headers):
+    pin = Pin(**pin_data)
+    db.session.add(pin)
+    db.session.commit()
+
+    for changes in ({"title": None}, {"author": None}, {"author": 5}, {"image_link": ""}):
+        response = client.patch(f'/api/pins/{pin.id}', json={**changes, "version": 1}, headers=auth_headers)
+        assert response.status_code == 400
+    assert db.session.get(Pin, pin.id).version == 1
+
+# Test POST /pins in write-behind mode returns the id assigned by the group commit
+def test_create_pin_write_behind(app, client, pin_data, auth_headers):
+    app.config["PIN_WRITE_BEHIND"] = True
+    app.config["PIN_WRITE_BEHIND_MAX_DELAY_MS"] = 1
+    payload = {key: pin_data[key] for key in ("title", "body", "image_link", "author")}
+    responses = [client.post('/api/pins', json=payload, headers=auth_headers) for _ in range(2)]
+    app.extensions['pin_writer'].close()
+
+    assert [r.status_code for r in responses] == [201, 201]
+    created = [r.get_json()["data"] for r in responses]
+    assert created[0]["id"] != created[1]["id"]
+    assert created[0]["version"] == 1
+    stored = db.session.get(Pin, created[1]["id"])
+    assert stored.title == pin_data["title"] and stored.author_norm == "alice"
+
+# Test GET /pins?total= reports the total and whether it is exact
+def test_get_pins_total(client, pin_data):
+    asyncio.run(Pin.bulk_create([pin_data, {**pin_data, "author": "Bob"}, {**pin_data, "author": "bob"}]))
+    body = client.get('/api/pins?limit=1&author=BOB&total=exact').get_json()
+    assert body["count"] == 1
+    assert body["total"] == 2 and body["total_exact"] is True
+    body = client.get('/api/pins?total=estimate').get_json()
+    assert body["total"] == 3
+    assert "total" not in client.get('/api/pins').get_json()
+    assert client.get('/api/pins?total=maybe').status_code == 400
+
+# Test a page with a total is not 304 once the total changes, even if its rows did not
+def test_get_pins_total_etag(client, pin_data):
+    asyncio.run(Pin.bulk_create([pin_data, {**pin_data, "date_created": datetime(2025, 1, 2)}]))
+    url = '/api/pins?limit=1&order_dir=asc&total=exact'
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    assert "Last-Modified" not in response.headers
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    plain_etag = client.get('/api/pins?limit=1&order_dir=asc').headers["ETag"]
+
+    asyncio.run(Pin.bulk_create([{**pin_data, "date_created": datetime(2025, 1, 3)}]))
+    assert client.get('/api/pins?limit=1&order_dir=asc', headers={"If-None-Match": plain_etag}).status_code == 304
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["total"] == 3
+
+# Test GET /pins/search?total= counts matches
+def test_search_pins_total(client, pin_data):
+    asyncio.run(Pin.bulk_create([{**pin_data, "title": f"Sunset {i}"} for i in range(3)]))
+    body = client.get('/api/pins/search?q=sunset&limit=1&total=estimate').get_json()
+    assert body["count"] == 1
+    assert body["total"] == 3 and body["total_exact"] is True
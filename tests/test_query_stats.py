@@ -0,0 +1,73 @@
+import logging
+import pytest
+from datetime import datetime
+from flask import Flask, jsonify
+from sqlalchemy import text
+from app.middleware.query_stats import QueryStats, register_query_stats
+from app.models.pin import Pin, db
+from app.routes.pins import pins_bp
+
+# Fixture for a debug app with query stats, the pins blueprint and an N+1 route
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["N_PLUS_ONE_THRESHOLD"] = 3
+    app.debug = True
+    db.init_app(app)
+    app.register_blueprint(pins_bp, url_prefix='/api')
+
+    @app.route('/n-plus-one')
+    def n_plus_one():
+        titles = [db.session.get(Pin, pin_id) for pin_id in range(1, 5)]
+        return jsonify({"count": len(titles)})
+
+    register_query_stats(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Pin(title="t", body="b", image_link="http://example.com/i.jpg", author="alice",
+                           date_created=datetime(2025, 1, 1)))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+# Test statements are counted and totals sent as headers in debug mode
+def test_headers_in_debug(app):
+    response = app.test_client().get('/api/pins/1')
+    assert response.status_code == 200
+    assert int(response.headers["X-SQL-Count"]) >= 1
+    assert float(response.headers["X-SQL-Time-Ms"]) >= 0
+    assert "X-SQL-N-Plus-One" not in response.headers
+
+# Test no headers are sent outside debug mode
+def test_no_headers_without_debug(app):
+    app.debug = False
+    response = app.test_client().get('/api/pins/1')
+    assert "X-SQL-Count" not in response.headers
+
+# Test a statement repeated within one request is flagged as N+1
+def test_n_plus_one(app, caplog):
+    with caplog.at_level(logging.WARNING, logger='app.middleware.query_stats'):
+        response = app.test_client().get('/n-plus-one')
+    assert response.headers["X-SQL-N-Plus-One"] == "1"
+    assert any("Possible N+1 in GET /n-plus-one" in record.message for record in caplog.records)
+
+# Test statements over the threshold are logged with their parameters
+def test_slow_query_log(caplog):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["SLOW_QUERY_MS"] = 0
+    db.init_app(app)
+    register_query_stats(app)
+    with app.app_context(), caplog.at_level(logging.WARNING, logger='app.middleware.query_stats'):
+        db.session.execute(text("SELECT :value"), {"value": 42})
+    assert any("Slow query" in r.message and "42" in r.message for r in caplog.records)
+
+# Test repeated() orders shapes by frequency and applies the threshold
+def test_repeated():
+    stats = QueryStats()
+    for statement in ("a", "b", "b", "b", "a", "c"):
+        stats.record(statement, 0.001)
+    assert stats.count == 6
+    assert stats.repeated(2) == [("b", 3), ("a", 2)]
@@ -0,0 +1,130 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from flask import Flask, jsonify
+from sqlalchemy import select, update
+from app.middleware.replica_routing import register_replica_routing
+from app.models.pin import CachedPin, Pin, db
+from app.routes.pins import pins_bp
+from app.utils.db_routing import replica_binds
+
+# Fixture for an app with a primary and two replicas, each a SQLite file holding one recognisable pin
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'primary.db'}"
+    app.config["SQLALCHEMY_BINDS"] = replica_binds([f"sqlite:///{tmp_path / f'replica{i}.db'}" for i in range(2)])
+    app.config["READ_YOUR_WRITES_SECONDS"] = 30
+    db.init_app(app)
+
+    @app.route('/title')
+    def title():
+        return jsonify({"title": db.session.scalar(select(Pin.title))})
+
+    @app.route('/title', methods=['PUT'])
+    def rename():
+        db.session.execute(update(Pin).values(title="renamed"))
+        db.session.commit()
+        return jsonify({"title": db.session.scalar(select(Pin.title))})
+
+    app.register_blueprint(pins_bp, url_prefix='/api')
+    register_replica_routing(app)
+    with app.app_context():
+        for name, engine in db.engines.items():
+            db.metadata.create_all(engine)
+            with engine.begin() as conn:
+                conn.execute(Pin.__table__.insert().values(
+                    title=name or "primary", body="b", image_link="http://example.com/i.jpg", author="alice",
+                    author_norm="alice", date_created=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1)))
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    # init_app registered an empty metadata per bind key on the shared db; drop them for later apps
+    for key in [key for key in db.metadatas if key is not None]:
+        del db.metadatas[key]
+
+# Test SELECTs alternate between the replicas
+def test_reads_round_robin(app):
+    with app.test_request_context():
+        titles = [db.session.scalar(select(Pin.title)) for _ in range(4)]
+    assert titles == ["replica_0", "replica_1", "replica_0", "replica_1"]
+
+# Test writes and every later read of the same request use the primary
+def test_writes_stick_to_primary(app):
+    with app.test_request_context():
+        db.session.execute(update(Pin).values(body="changed"))
+        db.session.commit()
+        assert db.session.scalar(select(Pin.title)) == "primary"
+        assert db.session.scalar(select(Pin.body)) == "changed"
+
+# Test SELECT ... FOR UPDATE goes to the primary
+def test_for_update_uses_primary(app):
+    with app.test_request_context():
+        assert db.session.scalar(select(Pin.title).with_for_update()) == "primary"
+
+# Test a client reads its own writes from the primary during the window; other clients use replicas
+def test_read_your_writes(app):
+    writer = app.test_client()
+    response = writer.put('/title')
+    assert response.get_json()["title"] == "renamed"
+    assert "last_write=" in response.headers["Set-Cookie"]
+    assert writer.get('/title').get_json()["title"] == "renamed"
+    assert app.test_client().get('/title').get_json()["title"].startswith("replica_")
+
+# Test an expired last_write cookie no longer pins reads to the primary
+def test_read_your_writes_window_expires(app):
+    client = app.test_client()
+    client.set_cookie('last_write', '1000.0')
+    assert client.get('/title').get_json()["title"].startswith("replica_")
+
+# Test a write request loads the row it modifies from the primary, not a stale replica
+def test_writes_read_from_primary(app):
+    with app.app_context():
+        with db.engines[None].begin() as conn:
+            conn.execute(update(Pin).values(version=3))
+    payload = {"title": "renamed", "body": "b", "image_link": "http://example.com/i.jpg", "author": "alice"}
+    with patch('app.middleware.auth.verify_jwt_token_cached', return_value={"sub": "1", "type": "access"}):
+        response = app.test_client().put('/api/pins/1', json=payload, headers={"Authorization": "Bearer t"})
+    assert response.status_code == 200
+    assert response.get_json()["data"]["version"] == 4
+
+# Test replica reads are never cached and a client in its window never reads the cache
+def test_read_your_writes_bypasses_pin_cache(app):
+    other, writer = app.test_client(), app.test_client()
+    assert other.get('/api/pins/1').get_json()["data"]["title"].startswith("replica_")
+    assert len(app.extensions['pin_cache']) == 0
+
+    payload = {"title": "new", "body": "b", "image_link": "http://example.com/i.jpg", "author": "alice"}
+    with patch('app.middleware.auth.verify_jwt_token_cached', return_value={"sub": "1", "type": "access"}):
+        assert writer.put('/api/pins/1', json=payload, headers={"Authorization": "Bearer t"}).status_code == 200
+    assert other.get('/api/pins/1').get_json()["data"]["title"].startswith("replica_")
+    assert len(app.extensions['pin_cache']) == 0
+
+    # An entry cached by a worker that has not seen the write yet
+    app.extensions['pin_cache'].set(1, CachedPin(b'{"title":"old"}', 2, datetime(2025, 1, 1)))
+    assert writer.get('/api/pins/1').get_json()["data"]["title"] == "new"
+    assert writer.get('/api/pins').get_json()["data"][0]["title"] == "new"
+    assert other.get('/api/pins?total=exact').get_json()["total_exact"] is False
+
+# Test a pin created in write-behind mode is read back from the primary by its author
+def test_read_your_writes_write_behind(app):
+    app.config["PIN_WRITE_BEHIND"] = True
+    app.config["PIN_WRITE_BEHIND_MAX_DELAY_MS"] = 1
+    writer = app.test_client()
+    payload = {"title": "queued", "body": "b", "image_link": "http://example.com/i.jpg", "author": "alice"}
+    with patch('app.middleware.auth.verify_jwt_token_cached', return_value={"sub": "1", "type": "access"}):
+        response = writer.post('/api/pins', json=payload, headers={"Authorization": "Bearer t"})
+    app.extensions['pin_writer'].close()
+    assert response.status_code == 201
+    assert "last_write=" in response.headers["Set-Cookie"]
+    pin_id = response.get_json()["data"]["id"]
+    assert writer.get(f'/api/pins/{pin_id}').get_json()["data"]["title"] == "queued"
+
+# Test nothing is routed without replica binds
+def test_no_replicas():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    db.init_app(app)
+    register_replica_routing(app)
+    assert 'replica_cycle' not in app.extensions
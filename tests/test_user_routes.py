@@ -90,4 +90,16 @@ def test_refresh_invalid_token(client, mock_jwt):
     headers = {"Authorization": "Bearer invalid_token"}
     mock_jwt.verify_jwt_token.return_value = None
     response = client.post('/api/refresh', headers=headers)
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+# Test POST /api/token answers 503 with Retry-After when the hashing pool is full
+def test_login_hashing_pool_saturated(client):
+    from app.models.user import User
+    from app.utils.hashing_pool import PoolSaturatedError
+
+    db.session.add(User(username="testuser", password_hash="hashed_password"))
+    db.session.commit()
+    with patch('app.models.user.User.check_password', side_effect=PoolSaturatedError):
+        response = client.post('/api/token', json={"username": "testuser", "password": "password123"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"